@@ -6,6 +6,8 @@
  */
 
 import MultiAI from '../src/index.js';
+import fs from 'fs';
+import { pathToFileURL } from 'url';
 
 async function runExamples() {
   console.log('🚀 Multi-AI Integration - Basic Usage Examples\n');
@@ -41,6 +43,19 @@ async function runExamples() {
       console.log('⚠️  Code chat failed:', error.message);
     }
 
+    // Example 2b: Batch chat - independent prompts sent concurrently
+    console.log('\n3b. Batch Chat Example:');
+    const batchResults = await ai.chatBatch([
+      'What is a closure?',
+      'What is a promise?',
+      'What is an event loop?'
+    ], { taskType: 'fast', maxConcurrency: 3 });
+    batchResults.forEach((result, i) => {
+      console.log(result.success
+        ? `  ${i + 1}. [${result.provider}] ${String(result.response).substring(0, 80)}...`
+        : `  ${i + 1}. ⚠️  ${result.error}`);
+    });
+
     // Example 3: Knowledge base usage
     console.log('\n4. Knowledge Base Example:');
     ai.addKnowledge('project_info', {
@@ -123,7 +138,8 @@ async function runExamples() {
 }
 
 // Run examples if this file is executed directly
-if (import.meta.url === `file://${process.argv[1]}`) {
+// Resolve symlinks and URL-escape the path before comparing
+if (process.argv[1] && import.meta.url === pathToFileURL(fs.realpathSync(process.argv[1])).href) {
   runExamples().catch(error => {
     console.error('Examples failed:', error);
     process.exit(1);
@@ -6,6 +6,7 @@ import { execSync } from 'child_process';
 import * as readline from 'readline';
 import fs from 'fs';
 import os from 'os';
+import { pathToFileURL } from 'url';
 
 /**
  * Enhanced Multi-AI Integration CLI
@@ -222,8 +223,9 @@ Just type your message and press Enter to chat!
     rl.prompt();
   });
 
-  rl.on('close', () => {
+  rl.on('close', async () => {
     console.log('\n👋 Goodbye!');
+    await ai.close();
     process.exit(0);
   });
 }
@@ -321,6 +323,33 @@ async function autoFix() {
   }
 }
 
+// Command name -> handler, looked up once instead of walking a switch
+const COMMAND_HANDLERS = {
+  chat: ({ ai, message, options }) => handleChatCommand(ai, message, options),
+  providers: ({ ai, options }) => handleProvidersCommand(ai, options),
+  models: ({ ai, options }) => handleModelsCommand(ai, options),
+  file: ({ ai, message, options }) => handleFileCommand(ai, message, options),
+  dir: ({ ai, message, options }) => handleDirectoryCommand(ai, message, options),
+  health: ({ ai, options }) => handleHealthCommand(ai, options),
+  status: ({ ai, options }) => handleStatusCommand(ai, options),
+  neural: ({ ai, options }) => handleNeuralInsightsCommand(ai, options),
+  insights: ({ ai, options }) => handleNeuralInsightsCommand(ai, options),
+  config: ({ ai, args, options }) => handleConfigCommand(ai, args.slice(1), options),
+  clear: ({ ai, options }) => handleClearCommand(ai, options),
+  update: ({ options }) => handleUpdateCommand(options),
+
+  // IDE integration commands
+  complete: ({ ideCommands, args, options }) => handleCompleteCommand(ideCommands, args, options),
+  explain: ({ ideCommands, args, options }) => handleExplainCommand(ideCommands, args, options),
+  refactor: ({ ideCommands, args, options }) => handleRefactorCommand(ideCommands, args, options),
+  debug: ({ ideCommands, args, options }) => handleDebugCommand(ideCommands, args, options),
+  commit: ({ ideCommands, options }) => handleCommitCommand(ideCommands, options),
+  review: ({ ideCommands, args, options }) => handleReviewCommand(ideCommands, args, options),
+  test: ({ ideCommands, args, options }) => handleTestCommand(ideCommands, args, options),
+  workspace: ({ ideCommands, options }) => handleWorkspaceCommand(ideCommands, options),
+  context: ({ ideCommands, args, options }) => handleContextCommand(ideCommands, args, options)
+};
+
 /**
  * Enhanced CLI runner with better error handling
  */
@@ -353,6 +382,14 @@ async function runCLI() {
 
   const { command, message, options } = parseArgs(args);
 
+  // Reject unknown commands before paying for provider initialization
+  const handler = Object.hasOwn(COMMAND_HANDLERS, command) ? COMMAND_HANDLERS[command] : null;
+  if (!handler) {
+    console.error(`❌ Unknown command: ${command}`);
+    console.log('Run "iris help" to see available commands.');
+    process.exit(1);
+  }
+
   // Initialize AI system
   const ai = new MultiAI();
   const ideCommands = new IDECommands(ai);
@@ -365,95 +402,7 @@ async function runCLI() {
     
     await ai.initializeProviders();
 
-    // Execute command
-    switch (command) {
-      case 'chat':
-        await handleChatCommand(ai, message, options);
-        break;
-
-      case 'providers':
-        await handleProvidersCommand(ai, options);
-        break;
-
-      case 'models':
-        await handleModelsCommand(ai, options);
-        break;
-
-      case 'file':
-        await handleFileCommand(ai, message, options);
-        break;
-
-      case 'dir':
-        await handleDirectoryCommand(ai, message, options);
-        break;
-
-      case 'health':
-        await handleHealthCommand(ai, options);
-        break;
-
-      case 'status':
-        await handleStatusCommand(ai, options);
-        break;
-
-      case 'neural':
-      case 'insights':
-        await handleNeuralInsightsCommand(ai, options);
-        break;
-
-      case 'config':
-        await handleConfigCommand(ai, args.slice(1), options);
-        break;
-
-      case 'clear':
-        await handleClearCommand(ai, options);
-        break;
-
-      case 'update':
-        await handleUpdateCommand(options);
-        break;
-
-      // IDE integration commands
-      case 'complete':
-        await handleCompleteCommand(ideCommands, args, options);
-        break;
-
-      case 'explain':
-        await handleExplainCommand(ideCommands, args, options);
-        break;
-
-      case 'refactor':
-        await handleRefactorCommand(ideCommands, args, options);
-        break;
-
-      case 'debug':
-        await handleDebugCommand(ideCommands, args, options);
-        break;
-
-      case 'commit':
-        await handleCommitCommand(ideCommands, options);
-        break;
-
-      case 'review':
-        await handleReviewCommand(ideCommands, args, options);
-        break;
-
-      case 'test':
-        await handleTestCommand(ideCommands, args, options);
-        break;
-
-      case 'workspace':
-        await handleWorkspaceCommand(ideCommands, options);
-        break;
-
-      case 'context':
-        await handleContextCommand(ideCommands, args, options);
-        break;
-
-      default:
-        console.error(`❌ Unknown command: ${command}`);
-        console.log('Run "iris help" to see available commands.');
-        process.exit(1);
-    }
+    await handler({ ai, ideCommands, message, args, options });
 
   } catch (error) {
     console.error(`❌ Command failed: ${error.message}`);
@@ -477,13 +426,35 @@ async function handleChatCommand(ai, message, options) {
   try {
     console.log(`💭 Processing message...`);
     
-    const startTime = Date.now();
-    const response = await ai.chat(message, options);
-    const duration = Date.now() - startTime;
+    // --stream prints chunks as they arrive from providers that support it,
+    // instead of waiting for the whole response
+    let streamedBy = null;
+    let streamedText = '';
+    const { stream, ...chatOptions } = options;
+    if (stream) {
+      chatOptions.onToken = (chunk, provider) => {
+        streamedBy = provider;
+        streamedText += chunk;
+        process.stdout.write(chunk);
+      };
+    }
+
+    const startTime = performance.now();
+    const response = await ai.chat(message, chatOptions);
+    const duration = Math.round(performance.now() - startTime);
 
-    // Display response
-    console.log(`\n[${response.provider}/${response.model}]`);
-    console.log(response.response);
+    // Display response - the streamed text only stands in for it when it
+    // came from the answering provider and matches the whole reply; a stream
+    // cut off by a failure or retry is followed by the full response
+    if (streamedBy === response.provider && streamedText === response.response) {
+      console.log(`\n\n[${response.provider}/${response.model}]`);
+    } else {
+      if (streamedText) {
+        console.log('\n\n⚠️  Stream interrupted - full response follows');
+      }
+      console.log(`\n[${response.provider}/${response.model}]`);
+      console.log(response.response);
+    }
     
     // Show metadata if verbose
     if (options.verbose) {
@@ -513,24 +484,24 @@ async function handleProvidersCommand(ai, options) {
   ai.displayProviderStatus();
   
   if (options.verbose) {
-    console.log('\n📈 Detailed Statistics:');
     const stats = ai.router.getProviderStats();
+    const lines = ['\n📈 Detailed Statistics:'];
 
     for (const [provider, data] of Object.entries(stats)) {
-      console.log(`\n📋 ${provider.toUpperCase()} Statistics:`);
-      console.log(`   Requests: ${data.requests}`);
-      console.log(`   Success Rate: ${data.successRate}`);
-      console.log(`   Avg Response Time: ${data.avgResponseTime?.toFixed(2) || 0}ms`);
-      console.log(`   Total Cost: $${data.totalCost?.toFixed(4) || '0.0000'}`);
+      lines.push(`\n📋 ${provider.toUpperCase()} Statistics:`);
+      lines.push(`   Requests: ${data.requests}`);
+      lines.push(`   Success Rate: ${data.successRate}`);
+      lines.push(`   Avg Response Time: ${data.avgResponseTime?.toFixed(2) || 0}ms`);
+      lines.push(`   Total Cost: $${data.totalCost?.toFixed(4) || '0.0000'}`);
       
       if (data.capabilities) {
-        const features = Object.entries(data.capabilities)
-          .filter(([_, v]) => v === true)
-          .map(([k, _]) => k)
+        const features = Object.keys(data.capabilities)
+          .filter(key => data.capabilities[key] === true)
           .join(', ');
-        console.log(`   Features: ${features || 'None'}`);
+        lines.push(`   Features: ${features || 'None'}`);
       }
     }
+    console.log(lines.join('\n'));
     
     console.log('\n💡 Use --task flags to influence provider selection:');
     console.log('   --task=fast    → Prioritizes speed (Mistral preferred)');
@@ -620,24 +591,25 @@ async function handleHealthCommand(ai, options) {
   
   if (options.verbose) {
     const healthChecks = await ai.router.healthCheckAll();
-    console.log('\n🔍 Detailed Health Information:');
+    const lines = ['\n🔍 Detailed Health Information:'];
     
     for (const [provider, health] of Object.entries(healthChecks)) {
-      console.log(`\n📋 ${provider.toUpperCase()}:`);
-      console.log(`   Status: ${health.status}`);
+      lines.push(`\n📋 ${provider.toUpperCase()}:`);
+      lines.push(`   Status: ${health.status}`);
       
       if (health.models !== undefined) {
-        console.log(`   Models: ${health.models}`);
+        lines.push(`   Models: ${health.models}`);
       }
       
       if (health.error) {
-        console.log(`   Error: ${health.error}`);
+        lines.push(`   Error: ${health.error}`);
       }
       
       if (health.version) {
-        console.log(`   Version: ${health.version}`);
+        lines.push(`   Version: ${health.version}`);
       }
     }
+    console.log(lines.join('\n'));
   }
   
   const status = ai.getProviderStatus();
@@ -657,26 +629,28 @@ async function handleStatusCommand(ai, options) {
   console.log('\n📊 Comprehensive System Status:');
   
   const status = await ai.getSystemStatus();
-  
-  console.log(`\n🚀 System Information:`);
-  console.log(`   Version: ${status.version}`);
-  console.log(`   Timestamp: ${status.timestamp}`);
-  
-  console.log(`\n🤖 Providers:`);
-  console.log(`   Total: ${status.providers.total}`);
-  console.log(`   Healthy: ${status.providers.healthy}`);
-  
-  console.log(`\n💾 Resources:`);
-  console.log(`   Knowledge Base Entries: ${status.resources.knowledgeBase.entries}`);
-  console.log(`   Context Length: ${status.resources.context.length}/${status.resources.context.maxLength}`);
-  console.log(`   Memory Usage: ${Math.round(status.resources.knowledgeBase.memoryUsage.heapUsed / 1024 / 1024)}MB`);
+  const { knowledgeBase, context } = status.resources;
+  
+  const lines = [
+    `\n🚀 System Information:`,
+    `   Version: ${status.version}`,
+    `   Timestamp: ${status.timestamp}`,
+    `\n🤖 Providers:`,
+    `   Total: ${status.providers.total}`,
+    `   Healthy: ${status.providers.healthy}`,
+    `\n💾 Resources:`,
+    `   Knowledge Base Entries: ${knowledgeBase.entries}`,
+    `   Context Length: ${context.length}/${context.maxLength}`,
+    `   Memory Usage: ${Math.round(knowledgeBase.memoryUsage.heapUsed / 1024 / 1024)}MB`
+  ];
 
   if (options.verbose) {
-    console.log(`\n📈 Recent Performance:`);
-    status.performance.recentRequests.forEach(req => {
-      console.log(`   ${req.provider}: ${req.responseTime}ms (${req.success ? 'success' : 'failed'})`);
-    });
+    lines.push(`\n📈 Recent Performance:`);
+    for (const req of status.performance.recentRequests) {
+      lines.push(`   ${req.provider}: ${req.responseTime}ms (${req.success ? 'success' : 'failed'})`);
+    }
   }
+  console.log(lines.join('\n'));
 }
 
 /**
@@ -918,7 +892,8 @@ async function handleUpdateCommand(options) {
 }
 
 // Run CLI if this file is executed directly
-if (import.meta.url === `file://${process.argv[1]}`) {
+// Resolve symlinks (npm bin links) and URL-escape the path before comparing
+if (process.argv[1] && import.meta.url === pathToFileURL(fs.realpathSync(process.argv[1])).href) {
   runCLI().catch(error => {
     console.error('❌ CLI Error:', error.message);
     process.exit(1);
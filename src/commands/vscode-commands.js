@@ -10,7 +10,7 @@
 
 import fs from 'fs';
 import path from 'path';
-import IDEFeatures from '../integrations/vscode-features.js';
+import IDEFeatures, { countLines } from '../integrations/vscode-features.js';
 
 export class IDECommands {
   constructor(multiAI) {
@@ -65,7 +65,7 @@ export class IDECommands {
       } else {
         // Explain entire file or significant portions
         const fileContent = fs.readFileSync(filePath, 'utf8');
-        const totalLines = fileContent.split('\n').length;
+        const totalLines = countLines(fileContent);
         const linesToExplain = Math.min(50, totalLines); // Explain first 50 lines max
         explanation = await this.ide.explainCode(filePath, 1, linesToExplain);
       }
@@ -5,9 +5,47 @@ import { usageMonitor } from './usage-monitor.js';
 import { errorRecovery } from './error-recovery.js';
 import { requestHandler } from './request-handler.js';
 import { messageFormatter } from './message-formatter.js';
-import { NeuralLearningSystem } from './neural-learning.js';
-
-const neuralSystem = new NeuralLearningSystem();
+import { neuralLearning as neuralSystem } from './neural-learning.js';
+import { ConcurrencyLimiter } from './concurrency-limiter.js';
+
+// Task-specific routing bonus by task type, then provider
+const TASK_ROUTING_BONUS = {
+  // Ollama (free, local) - prioritized for most tasks
+  // Groq - ultra-fast responses, low cost
+  // OpenAI - best for complex reasoning and advanced coding
+  // Gemini - multimodal and creative tasks
+  // Claude - general reasoning (lower priority due to cost)
+  fast: { ollama: 25, groq: 22 },
+  code: { ollama: 20, openai: 18, groq: 15 },
+  creative: { ollama: 15, groq: 12, gemini: 12, claude: 6 },
+  analysis: { openai: 15, ollama: 10, gemini: 10, claude: 6 },
+  vision: { openai: 20, ollama: 15, gemini: 15 },
+  reasoning: { openai: 25, ollama: 8, claude: 8 },
+  complex: { openai: 20, claude: 10 },
+  balanced: { groq: 10 },
+  multimodal: { gemini: 18 },
+
+  // Specialized task routing
+  github: { ollama: 20 },
+  build: { ollama: 18 },
+  deploy: { openai: 12 },
+  ultra_fast: { groq: 30 }
+};
+
+// One entry of the router's request history. Every entry has the same
+// fields set in the same order (one object shape), and entries are frozen
+// since getRequestHistory hands them out without copying
+class RequestRecord {
+  constructor(message, provider, taskType, success, responseTime) {
+    this.message = message;
+    this.provider = provider;
+    this.taskType = taskType;
+    this.success = success;
+    this.responseTime = responseTime;
+    this.timestamp = new Date().toISOString();
+    Object.freeze(this);
+  }
+}
 
 /**
  * Smart AI Router - Intelligently routes requests to the best available provider
@@ -18,11 +56,25 @@ const neuralSystem = new NeuralLearningSystem();
  * @copyright 2025 Jordan After Midnight. All rights reserved.
  */
 export class AIRouter {
-  constructor() {
+  constructor(options = {}) {
     this.providers = new Map();
     this.fallbackOrder = [];
     this.requestHistory = [];
+    this.maxHistorySize = options.maxHistorySize || 100;
     this.providerStats = new Map();
+    this.limiter = new ConcurrencyLimiter(
+      options.maxConcurrentRequests || 5,
+      options.maxQueuedRequests || Infinity
+    );
+    this.availabilityCache = new Map();
+    this.availabilityTTL = options.availabilityTTL ?? 5000;
+    this.rateLimiters = new Map();
+    this.baseScores = new Map();
+    // Capabilities are static per provider - read once at registration
+    this.capabilities = new Map();
+    // Formatted per-provider stats for reports, rebuilt only after the
+    // provider's stats change
+    this.statsReports = new Map();
   }
 
   /**
@@ -30,6 +82,9 @@ export class AIRouter {
    */
   registerProvider(provider) {
     this.providers.set(provider.name, provider);
+    this.baseScores.delete(provider.name);
+    this.statsReports.delete(provider.name);
+    this.capabilities.set(provider.name, Object.freeze(provider.getCapabilities()));
     this.providerStats.set(provider.name, {
       requests: 0,
       successes: 0,
@@ -39,122 +94,199 @@ export class AIRouter {
     });
   }
 
+  /**
+   * Attach a rate limiter (TokenBucket or SlidingWindowLimiter) to a provider
+   */
+  setRateLimit(name, limiter) {
+    this.rateLimiters.set(name, limiter);
+  }
+
   /**
    * Set fallback order for providers
    */
   setFallbackOrder(order) {
-    this.fallbackOrder = order;
+    // Deduplicated once here, so fallback attempts just walk the list
+    this.fallbackOrder = [...new Set(order)];
+  }
+
+  /**
+   * Check provider availability, reusing a recent result when one exists.
+   * Some availability checks are full network round-trips, so answers are
+   * kept for a few seconds instead of being re-fetched on every request
+   */
+  async checkAvailability(provider) {
+    const cached = this.cachedAvailability(provider.name);
+    if (cached !== undefined) {
+      return cached;
+    }
+
+    const available = await provider.isAvailable();
+    this.availabilityCache.set(provider.name, { available, checkedAt: performance.now() });
+    return available;
+  }
+
+  /**
+   * Availability from a check still within the TTL, or undefined - never
+   * probes the provider
+   */
+  cachedAvailability(name) {
+    const cached = this.availabilityCache.get(name);
+    return cached && performance.now() - cached.checkedAt < this.availabilityTTL
+      ? cached.available
+      : undefined;
   }
 
   /**
    * Smart provider selection based on task type, availability, and performance
    */
-  async selectProvider(taskType = 'balanced', options = {}) {
-    const availableProviders = [];
-    
-    // Check availability of all providers
-    for (const [name, provider] of this.providers) {
+  async selectProvider(taskType = 'balanced', options = {}, failedOver = false) {
+    const excluded = options.excludeProviders || [];
+
+    // Retries after a provider failed walk the static fallback order
+    // rather than re-scoring every provider. Exclusions passed in by the
+    // caller still go through scoring
+    if (failedOver && excluded.length > 0) {
+      const fallback = await this.nextFallbackProvider(excluded);
+      if (fallback) return fallback;
+    }
+
+    // Check availability of all providers concurrently so the network
+    // round-trips overlap instead of adding up
+    const providers = Array.from(this.providers.values())
+      .filter(provider => !excluded.includes(provider.name) &&
+        (this.rateLimiters.get(provider.name)?.hasCapacity() ?? true));
+    const availability = await Promise.all(providers.map(async (provider) => {
       try {
-        const isAvailable = await provider.isAvailable();
-        if (isAvailable) {
-          availableProviders.push({
-            name,
-            provider,
-            priority: provider.priority || 10,
-            cost: provider.costPerToken || 0,
-            stats: this.providerStats.get(name)
-          });
-        }
+        return await this.checkAvailability(provider);
       } catch (error) {
         // Provider availability check failed - silent fallback
+        return false;
+      }
+    }));
+
+    // Score each available provider once
+    const scores = providers.map((provider, i) =>
+      availability[i] ? this.scoreProvider(provider, taskType, options) : -Infinity);
+
+    // Keep the best as we go - no intermediate records, no sort. The rate
+    // limit is only claimed after the availability await, when another
+    // request may have taken the last slot; if so, drop it and pick again
+    for (;;) {
+      let bestIndex = -1;
+      for (let i = 0; i < providers.length; i++) {
+        if (availability[i] && (bestIndex === -1 || scores[i] > scores[bestIndex] ||
+            (scores[i] === scores[bestIndex] && this.ranksBefore(providers[i], providers[bestIndex])))) {
+          bestIndex = i;
+        }
+      }
+
+      if (bestIndex === -1) {
+        throw new Error('No AI providers are currently available');
       }
-    }
 
-    if (availableProviders.length === 0) {
-      throw new Error('No AI providers are currently available');
+      const best = providers[bestIndex];
+      if (this.rateLimiters.get(best.name)?.tryAcquire() ?? true) {
+        return best;
+      }
+      availability[bestIndex] = false;
     }
+  }
 
-    // Scoring algorithm for provider selection
-    const scoredProviders = availableProviders.map(({ name, provider, priority, cost, stats }) => {
-      let score = 0;
-
-      // Priority score (higher priority = higher score)
-      score += (10 - priority) * 20;
-
-      // Success rate score
-      const successRate = stats.requests > 0 ? stats.successes / stats.requests : 1;
-      score += successRate * 30;
-
-      // Speed score (lower response time = higher score)
-      const speedScore = stats.avgResponseTime > 0 ? Math.max(0, 100 - stats.avgResponseTime / 100) : 50;
-      score += speedScore * 20;
-
-      // Cost score (heavily favor free local models)
-      const costScore = cost === 0 ? 50 : Math.max(0, 30 - cost * 1000);
-      score += costScore;
-
-      // Strong bonus for Ollama/Mistral to minimize API costs
-      if (name === 'ollama') score += 25;
-
-      // Enhanced task-specific routing with all providers
-      
-      // Ollama (free, local) - prioritize for most tasks
-      if (taskType === 'fast' && name === 'ollama') score += 25;
-      if (taskType === 'code' && name === 'ollama') score += 20;
-      if (taskType === 'creative' && name === 'ollama') score += 15;
-      if (taskType === 'analysis' && name === 'ollama') score += 10;
-      if (taskType === 'vision' && name === 'ollama') score += 15;
-      if (taskType === 'reasoning' && name === 'ollama') score += 8; // Slightly lower for complex reasoning
-      
-      // Groq - ultra-fast responses, low cost
-      if (taskType === 'fast' && name === 'groq') score += 22;
-      if (taskType === 'code' && name === 'groq') score += 15;
-      if (taskType === 'creative' && name === 'groq') score += 12;
-      if (taskType === 'balanced' && name === 'groq') score += 10;
-      
-      // OpenAI - best for complex reasoning and advanced coding
-      if (taskType === 'complex' && name === 'openai') score += 20;
-      if (taskType === 'reasoning' && name === 'openai') score += 25;
-      if (taskType === 'code' && name === 'openai') score += 18;
-      if (taskType === 'analysis' && name === 'openai') score += 15;
-      if (taskType === 'vision' && name === 'openai') score += 20;
-      
-      // Gemini - multimodal and creative tasks
-      if (taskType === 'creative' && name === 'gemini') score += 12;
-      if (taskType === 'analysis' && name === 'gemini') score += 10;
-      if (taskType === 'vision' && name === 'gemini') score += 15;
-      if (taskType === 'multimodal' && name === 'gemini') score += 18;
-      
-      // Claude - general reasoning (lower priority due to cost)
-      if (taskType === 'complex' && name === 'claude') score += 10;
-      if (taskType === 'reasoning' && name === 'claude') score += 8;
-      if (taskType === 'creative' && name === 'claude') score += 6;
-      if (taskType === 'analysis' && name === 'claude') score += 6;
-      
-      // Specialized task routing
-      if (taskType === 'github' && name === 'ollama') score += 20;
-      if (taskType === 'build' && name === 'ollama') score += 18;
-      if (taskType === 'deploy' && name === 'openai') score += 12;
-      if (taskType === 'ultra_fast' && name === 'groq') score += 30;
-
-      // Privacy preference
-      if (options.preferLocal && provider.getCapabilities().privacy === 'local') {
-        score += 25;
+  /**
+   * Tie-break between equally scored providers: lower priority number
+   * first, then name. Providers register as their async setup finishes, so
+   * registration order can't be relied on
+   */
+  ranksBefore(a, b) {
+    const priorityA = a.priority ?? Infinity;
+    const priorityB = b.priority ?? Infinity;
+    if (priorityA !== priorityB) return priorityA < priorityB;
+    return a.name < b.name;
+  }
+
+  /**
+   * First available provider in the fallback order that is not excluded
+   */
+  async nextFallbackProvider(excluded) {
+    for (const name of this.fallbackOrder) {
+      const provider = this.providers.get(name);
+      const limiter = this.rateLimiters.get(name);
+      if (!provider || excluded.includes(name) || (limiter && !limiter.hasCapacity())) {
+        continue;
       }
 
-      // Budget constraints
-      if (options.maxCost && cost > options.maxCost) {
-        score -= 50;
+      try {
+        // Claim the rate limit after the await - it may have filled up
+        // meanwhile, in which case move on
+        if (await this.checkAvailability(provider) && (limiter?.tryAcquire() ?? true)) {
+          return provider;
+        }
+      } catch (error) {
+        // Unavailable - try the next one
       }
+    }
 
-      return { name, provider, score };
-    });
+    return null;
+  }
+
+  /**
+   * Scoring algorithm for provider selection
+   */
+  scoreProvider(provider, taskType, options = {}) {
+    const { score: baseScore, cost, local } = this.getBaseScore(provider);
+    let score = baseScore;
 
-    // Sort by score (highest first)
-    scoredProviders.sort((a, b) => b.score - a.score);
+    // Task-specific routing bonus
+    score += TASK_ROUTING_BONUS[taskType]?.[provider.name] || 0;
+
+    // Privacy preference
+    if (options.preferLocal && local) {
+      score += 25;
+    }
+
+    // Budget constraints
+    if (options.maxCost && cost > options.maxCost) {
+      score -= 50;
+    }
 
-    // Return the best provider
-    return scoredProviders[0].provider;
+    return score;
+  }
+
+  /**
+   * Request-independent part of a provider's score. It only changes when
+   * the provider's stats do, so it is cached until the next stats update
+   */
+  getBaseScore(provider) {
+    const name = provider.name;
+    let entry = this.baseScores.get(name);
+    if (entry) return entry;
+
+    const priority = provider.priority || 10;
+    const cost = provider.costPerToken || 0;
+    const stats = this.providerStats.get(name);
+    let score = 0;
+
+    // Priority score (higher priority = higher score)
+    score += (10 - priority) * 20;
+
+    // Success rate score
+    const successRate = stats.requests > 0 ? stats.successes / stats.requests : 1;
+    score += successRate * 30;
+
+    // Speed score (lower response time = higher score)
+    const speedScore = stats.avgResponseTime > 0 ? Math.max(0, 100 - stats.avgResponseTime / 100) : 50;
+    score += speedScore * 20;
+
+    // Cost score (heavily favor free local models)
+    const costScore = cost === 0 ? 50 : Math.max(0, 30 - cost * 1000);
+    score += costScore;
+
+    // Strong bonus for Ollama/Mistral to minimize API costs
+    if (name === 'ollama') score += 25;
+
+    entry = { score, cost, local: this.capabilities.get(name).privacy === 'local' };
+    this.baseScores.set(name, entry);
+    return entry;
   }
 
   /**
@@ -170,15 +302,18 @@ export class AIRouter {
       throw error;
     }
 
-    // Format and validate messages
-    let formattedMessages = messageFormatter.formatMessages(
-      options.provider || 'openai',
-      typeof message === 'string' ? [{ role: 'user', content: message }] : message,
-      options
-    );
+    // Work on a request-scoped copy - prediction and recovery below adjust
+    // options, and the caller's object may be shared across requests
+    options = { ...options };
+
+    // Formatted messages are only needed by error recovery, so they are
+    // built on the first failure rather than for every request
+    let formattedMessages = null;
     
     // Get neural prediction for best provider
-    const predictedProvider = neuralSystem.predictBestProvider(message, options.taskType || 'balanced');
+    // Patterns are extracted once and shared by prediction and learning
+    const patterns = neuralSystem.extractPatterns(message);
+    const predictedProvider = neuralSystem.predictBestProvider(message, options.taskType || 'balanced', patterns);
     if (predictedProvider && !options.provider) {
       options.provider = predictedProvider;
     }
@@ -195,39 +330,43 @@ export class AIRouter {
     const maxRetries = options.maxRetries || 3;
     let lastError;
     let attemptCount = 0;
+    // Set once a failed provider has been excluded for the retries
+    let failedOver = false;
 
     for (let attempt = 0; attempt < maxRetries; attempt++) {
+      let provider = null;
       try {
-        const provider = await this.selectProvider(taskType, options);
-        const startTime = Date.now();
-        
-        // Provider selected for task execution
-
-        let result;
-        if (options.stream) {
-          result = await provider.streamChat(message, options);
-        } else {
-          result = await provider.chat(message, options);
-        }
-
-        const responseTime = Date.now() - startTime;
+        provider = await this.selectProvider(taskType, options, failedOver);
+
+        // Provider selected for task execution. Calls go through the shared
+        // limiter so a burst of requests cannot pile onto the providers
+        // (local models especially) all at once; time spent queued is not
+        // counted as provider response time
+        const selected = provider;
+        const { result, responseTime } = await this.limiter.run(async () => {
+          const startTime = performance.now();
+          const result = options.stream
+            ? await selected.streamChat(message, options)
+            : await selected.chat(message, options);
+          return { result, responseTime: Math.round(performance.now() - startTime) };
+        });
         
         // Update provider statistics
         this.updateProviderStats(provider.name, true, responseTime, result.usage?.cost || 0);
         
         // Add to request history
-        this.requestHistory.push({
-          message: message.substring(0, 100) + '...',
-          provider: provider.name,
-          taskType,
-          success: true,
-          responseTime,
-          timestamp: new Date().toISOString()
-        });
+        this.requestHistory.push(new RequestRecord(
+          message.substring(0, 100) + '...', provider.name, taskType, true, responseTime));
+
+        // Bounded history - drop the oldest entry instead of growing forever
+        if (this.requestHistory.length > this.maxHistorySize) {
+          this.requestHistory.shift();
+        }
 
         // Learn from success
         neuralSystem.learnFromSuccess({
           message,
+          patterns,
           provider: provider.name,
           taskType,
           responseTime,
@@ -237,8 +376,39 @@ export class AIRouter {
         return result;
 
       } catch (error) {
+        // Selection failed - no provider left to try
+        if (!provider) {
+          if (!lastError) throw error;
+          break;
+        }
+
+        // Router overloaded - not the provider's fault, and no other
+        // provider would get a slot either. Nothing was sent, so the rate
+        // limit token taken at selection goes back
+        if (error.code === 'QUEUE_FULL') {
+          this.rateLimiters.get(provider.name)?.release();
+          throw error;
+        }
+
         attemptCount++;
         lastError = error;
+
+        // Record the failure against the provider that actually failed, so
+        // its stats (and therefore its score) reflect the outage
+        this.updateProviderStats(provider.name, false, 0, 0);
+        neuralSystem.learnFromError({
+          error: lastError,
+          provider: provider.name,
+          message,
+          patterns,
+          taskType
+        });
+        
+        formattedMessages ??= messageFormatter.formatMessages(
+          options.provider || 'openai',
+          typeof message === 'string' ? [{ role: 'user', content: message }] : message,
+          options
+        );
         
         // Try error recovery
         const recovery = await errorRecovery.recoverFromError(error, {
@@ -259,6 +429,7 @@ export class AIRouter {
           }
           if (recovery.modifications.useAlternateProvider) {
             options.excludeProviders = [...(options.excludeProviders || []), provider.name];
+            failedOver = true;
           }
           
           // Wait before retry if needed
@@ -271,17 +442,10 @@ export class AIRouter {
         } else if (recovery.action === 'fail') {
           throw new Error(recovery.error || error.message);
         }
-        
-        // Learn from failure
-        neuralSystem.learnFromError({
-          error: lastError,
-          provider: provider.name,
-          message,
-          taskType
-        });
-        
-        // Update failure stats
-        this.updateProviderStats(provider.name, false, 0, 0);
+
+        // No recovery strategy - fall back to a different provider
+        options.excludeProviders = [...(options.excludeProviders || []), provider.name];
+        failedOver = true;
       }
     }
 
@@ -295,6 +459,8 @@ export class AIRouter {
     const stats = this.providerStats.get(providerName);
     if (!stats) return;
 
+    this.baseScores.delete(providerName);
+    this.statsReports.delete(providerName);
     stats.requests++;
     if (success) {
       stats.successes++;
@@ -317,15 +483,20 @@ export class AIRouter {
    */
   getProviderStats() {
     const stats = {};
-    for (const [name, provider] of this.providers) {
-      const providerStats = this.providerStats.get(name);
-      stats[name] = {
-        ...providerStats,
-        capabilities: provider.getCapabilities(),
-        successRate: providerStats.requests > 0 ? 
-          (providerStats.successes / providerStats.requests * 100).toFixed(1) + '%' : 
-          'N/A'
-      };
+    for (const name of this.providers.keys()) {
+      let report = this.statsReports.get(name);
+      if (!report) {
+        const providerStats = this.providerStats.get(name);
+        report = Object.freeze({
+          ...providerStats,
+          capabilities: this.capabilities.get(name),
+          successRate: providerStats.requests > 0 ? 
+            (providerStats.successes / providerStats.requests * 100).toFixed(1) + '%' : 
+            'N/A'
+        });
+        this.statsReports.set(name, report);
+      }
+      stats[name] = report;
     }
     return stats;
   }
@@ -342,8 +513,10 @@ export class AIRouter {
    */
   async healthCheckAll() {
     const results = {};
-    
-    for (const [name, provider] of this.providers) {
+
+    // Bounded fan-out: a slow provider only holds one slot instead of
+    // blocking every check queued behind it
+    await this.limiter.map(this.providers, async ([name, provider]) => {
       try {
         results[name] = await provider.healthCheck();
       } catch (error) {
@@ -354,49 +527,66 @@ export class AIRouter {
           timestamp: new Date().toISOString()
         };
       }
-    }
-    
+    });
+
     return results;
   }
 
+  /**
+   * Warm up a provider that supports it (e.g. load a local model into memory)
+   */
+  async prewarmProvider(provider, taskType = 'balanced') {
+    if (typeof provider.warmup === 'function') {
+      await provider.warmup(taskType);
+    }
+  }
+
   /**
    * Compare providers for a specific task
    */
   async compareProviders(message, taskType = 'balanced', providers = []) {
-    const results = [];
     const targetProviders = providers.length > 0 ? providers : Array.from(this.providers.keys());
-    
-    for (const providerName of targetProviders) {
+
+    // Query every provider concurrently - total latency is the slowest
+    // provider rather than the sum of all of them
+    const results = await Promise.all(targetProviders.map(async (providerName) => {
       const provider = this.providers.get(providerName);
-      if (!provider) continue;
-      
+      if (!provider) return null;
+
       try {
-        const isAvailable = await provider.isAvailable();
-        if (!isAvailable) continue;
-        
-        const startTime = Date.now();
-        const result = await provider.chat(message, { taskType });
-        const responseTime = Date.now() - startTime;
-        
-        results.push({
+        const isAvailable = await this.checkAvailability(provider);
+        if (!isAvailable) return null;
+
+        // Keep one-time model load cost out of the measured response time.
+        // Warming up inside the provider's own task means one slow model
+        // load doesn't hold back every other provider's query
+        await this.prewarmProvider(provider, taskType);
+
+        const { result, responseTime } = await this.limiter.run(async () => {
+          const startTime = performance.now();
+          const result = await provider.chat(message, { taskType });
+          return { result, responseTime: Math.round(performance.now() - startTime) };
+        });
+
+        return {
           provider: providerName,
           response: result.response,
           responseTime,
           cost: result.usage?.cost || 0,
           model: result.model,
           success: true
-        });
-        
+        };
+
       } catch (error) {
-        results.push({
+        return {
           provider: providerName,
           error: error.message,
           success: false
-        });
+        };
       }
-    }
-    
-    return results;
+    }));
+
+    return results.filter(Boolean);
   }
 }
 
@@ -8,6 +8,14 @@
  * @copyright 2025 Jordan After Midnight. All rights reserved.
  */
 
+// Model to retry with when a provider rejects the requested one
+const FALLBACK_MODELS = {
+  groq: 'llama-3.1-8b-instant',
+  openai: 'gpt-3.5-turbo',
+  claude: 'claude-3-sonnet-20240229',
+  gemini: 'gemini-pro'
+};
+
 export class ApiValidator {
   constructor() {
     this.maxMessageLength = 10000;
@@ -184,14 +192,7 @@ export class ApiValidator {
    * Get fallback model
    */
   getFallbackModel(provider) {
-    const fallbacks = {
-      groq: 'llama-3.1-8b-instant',
-      openai: 'gpt-3.5-turbo',
-      claude: 'claude-3-sonnet-20240229',
-      gemini: 'gemini-pro'
-    };
-
-    return fallbacks[provider] || 'gpt-3.5-turbo';
+    return FALLBACK_MODELS[provider] || 'gpt-3.5-turbo';
   }
 }
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env node
+
+/**
+ * Concurrency Limiter
+ * Promise-based counting semaphore that caps how many async tasks run at once
+ *
+ * @author Jordan After Midnight
+ * @copyright 2025 Jordan After Midnight. All rights reserved.
+ */
+
+export class ConcurrencyLimiter {
+  constructor(maxConcurrent = 5, maxQueued = Infinity) {
+    this.maxConcurrent = Math.max(1, maxConcurrent);
+    // Tasks allowed to wait for a slot; beyond that run() rejects at once,
+    // so an overload surfaces as backpressure instead of a growing queue
+    this.maxQueued = maxQueued;
+    this.active = 0;
+    this.queue = [];
+  }
+
+  /**
+   * Run a task once a slot is free
+   */
+  async run(task) {
+    if (this.active >= this.maxConcurrent) {
+      if (this.queue.length >= this.maxQueued) {
+        const error = new Error(`Too many requests queued (limit ${this.maxQueued})`);
+        error.code = 'QUEUE_FULL';
+        throw error;
+      }
+      // Slot is handed over directly by the finishing task
+      await new Promise(resolve => this.queue.push(resolve));
+    } else {
+      this.active++;
+    }
+
+    try {
+      return await task();
+    } finally {
+      // After a shrink, finishing tasks give up their slots until the
+      // active count is back under the limit
+      const next = this.active <= this.maxConcurrent ? this.queue.shift() : undefined;
+      if (next) {
+        next();
+      } else {
+        this.active--;
+      }
+    }
+  }
+
+  /**
+   * Change the concurrency cap. Growing starts queued tasks right away;
+   * shrinking lets running tasks finish
+   */
+  resize(maxConcurrent) {
+    this.maxConcurrent = Math.max(1, maxConcurrent);
+    while (this.active < this.maxConcurrent && this.queue.length > 0) {
+      this.active++;
+      this.queue.shift()();
+    }
+  }
+
+  /**
+   * Map items through an async function with bounded concurrency
+   */
+  map(items, fn) {
+    return Promise.all(Array.from(items, (item, index) => this.run(() => fn(item, index))));
+  }
+}
+
+export default ConcurrencyLimiter;
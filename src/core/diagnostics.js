@@ -8,9 +8,16 @@
 import { execSync } from 'child_process';
 import fs from 'fs';
 import os from 'os';
+import { OllamaProvider } from '../providers/ollama-provider.js';
+
+// Transport for the Ollama probe: same 5s cap the CLI check had. Defined
+// once so every probe shares one pooled client
+const probeFetch = (url, init = {}) => fetch(url, { ...init, signal: AbortSignal.timeout(5000) });
 
 export class DiagnosticsSystem {
-  constructor() {
+  constructor(options = {}) {
+    // Same host the ollama CLI would talk to; unset means the local default
+    this.ollamaHost = options.ollamaHost || process.env.OLLAMA_HOST;
     this.issues = [];
     this.fixes = [];
     this.healthScore = 100;
@@ -81,20 +88,21 @@ export class DiagnosticsSystem {
       'http://localhost:11434'
     ];
 
-    const results = [];
-    for (const endpoint of endpoints) {
+    // Probe every endpoint at once - the check takes as long as the slowest
+    // endpoint instead of the sum. Only failures are reported
+    const probes = await Promise.all(endpoints.map(async (endpoint) => {
       try {
         const response = await fetch(endpoint, { 
           method: 'HEAD', 
-          timeout: 5000 
+          signal: AbortSignal.timeout(5000)
         });
-        results.push({ endpoint, status: response.status < 500 });
+        return response.status >= 500 ? { endpoint, status: false } : null;
       } catch (error) {
-        results.push({ endpoint, status: false, error: error.message });
+        return { endpoint, status: false, error: error.message };
       }
-    }
+    }));
+    const failed = probes.filter(Boolean);
 
-    const failed = results.filter(r => !r.status);
     if (failed.length > 0) {
       this.issues.push({
         type: 'network',
@@ -112,10 +120,15 @@ export class DiagnosticsSystem {
   /**
    * Check Ollama service
    */
-  checkOllamaService() {
+  async checkOllamaService() {
     try {
-      const result = execSync('ollama list', { encoding: 'utf8', timeout: 5000 });
-      const models = result.split('\n').filter(line => line.includes(':')).length;
+      // Asked over the API instead of a blocking `ollama list` subprocess,
+      // which would stall the other checks running alongside this one
+      const provider = new OllamaProvider({ host: this.ollamaHost, fetch: probeFetch });
+      if (!provider.ollama) {
+        throw new Error('Ollama client not installed');
+      }
+      const models = (await provider.getAvailableModels(true)).length;
       
       if (models === 0) {
         this.issues.push({
@@ -175,29 +188,29 @@ export class DiagnosticsSystem {
    * Check API quotas
    */
   async checkAPIQuotas() {
-    const quotaChecks = [];
+    const requests = [];
     
     // Check Groq quota
     if (process.env.GROQ_API_KEY) {
-      try {
-        const response = await fetch('https://api.groq.com/openai/v1/models', {
-          headers: { 'Authorization': `Bearer ${process.env.GROQ_API_KEY}` }
-        });
-        quotaChecks.push({ provider: 'groq', status: response.ok });
-      } catch (error) {
-        quotaChecks.push({ provider: 'groq', status: false, error: error.message });
-      }
+      requests.push(['groq', () => fetch('https://api.groq.com/openai/v1/models', {
+        headers: { 'Authorization': `Bearer ${process.env.GROQ_API_KEY}` }
+      })]);
     }
 
     // Check Gemini quota
     if (process.env.GEMINI_API_KEY) {
+      requests.push(['gemini', () => fetch(`https://generativelanguage.googleapis.com/v1beta/models?key=${process.env.GEMINI_API_KEY}`)]);
+    }
+
+    // Independent round-trips, so issue them together
+    const quotaChecks = await Promise.all(requests.map(async ([provider, request]) => {
       try {
-        const response = await fetch(`https://generativelanguage.googleapis.com/v1beta/models?key=${process.env.GEMINI_API_KEY}`);
-        quotaChecks.push({ provider: 'gemini', status: response.ok });
+        const response = await request();
+        return { provider, status: response.ok };
       } catch (error) {
-        quotaChecks.push({ provider: 'gemini', status: false, error: error.message });
+        return { provider, status: false, error: error.message };
       }
-    }
+    }));
 
     const failed = quotaChecks.filter(q => !q.status);
     if (failed.length > 0) {
@@ -335,7 +348,14 @@ export class DiagnosticsSystem {
   async fixOllamaModels() {
     console.log('   Installing basic Ollama model...');
     try {
-      execSync('ollama pull llama3.2:latest', { timeout: 300000 }); // 5 minutes
+      // Pulled over the HTTP API - no CLI process, and progress as it happens
+      let lastStatus = '';
+      await new OllamaProvider({ host: this.ollamaHost }).pullModel('llama3.2:latest', ({ status }) => {
+        if (status !== lastStatus) {
+          lastStatus = status;
+          console.log(`   ${status}`);
+        }
+      });
       console.log('   Basic model installed');
     } catch (error) {
       throw new Error('Failed to install Ollama model');
@@ -359,6 +379,13 @@ export class DiagnosticsSystem {
    * Generate diagnostic report
    */
   generateReport() {
+    let autoFixed = 0;
+    let failedFixes = 0;
+    for (const fix of this.fixes) {
+      if (fix.status === 'fixed') autoFixed++;
+      else if (fix.status === 'failed') failedFixes++;
+    }
+
     const report = {
       timestamp: new Date().toISOString(),
       healthScore: this.healthScore,
@@ -366,8 +393,8 @@ export class DiagnosticsSystem {
       fixes: this.fixes,
       summary: {
         totalIssues: this.issues.length,
-        autoFixed: this.fixes.filter(f => f.status === 'fixed').length,
-        failedFixes: this.fixes.filter(f => f.status === 'failed').length,
+        autoFixed,
+        failedFixes,
         status: this.healthScore > 80 ? 'healthy' : this.healthScore > 60 ? 'warning' : 'critical'
       }
     };
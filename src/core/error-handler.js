@@ -1,5 +1,19 @@
 #!/usr/bin/env node
 
+import { performance } from 'perf_hooks';
+
+// Window of rate-limit errors that count towards backoff
+const BACKOFF_WINDOW_MS = 5 * 60 * 1000;
+
+// Known-good model per provider for invalid-model recovery
+const DEFAULT_MODELS = {
+  'openai': 'gpt-3.5-turbo',
+  'groq': 'llama-3.1-8b-instant',
+  'gemini': 'gemini-1.5-flash',
+  'claude': 'claude-3-haiku-20240307',
+  'ollama': 'llama3.2:latest'
+};
+
 /**
  * Enhanced Error Handler with Self-Healing Capabilities
  * Provides intelligent error recovery and API request validation
@@ -8,6 +22,9 @@
 export class ErrorHandler {
   constructor() {
     this.errorHistory = [];
+    // Rate-limit error times per provider (monotonic, oldest first), so
+    // backoff needs neither a history scan nor timestamp parsing
+    this.rateLimitTimes = new Map();
     this.recoveryStrategies = new Map();
     this.knownIssues = {
       '400': {
@@ -43,6 +60,12 @@ export class ErrorHandler {
       model: context.model
     });
 
+    if (errorInfo.type === 'rate_limit') {
+      const times = this.rateLimitTimes.get(context.provider) || [];
+      times.push(performance.now());
+      this.rateLimitTimes.set(context.provider, times);
+    }
+
     // Determine recovery strategy
     const strategy = this.determineRecoveryStrategy(errorInfo, context);
     
@@ -145,14 +168,7 @@ export class ErrorHandler {
    * Get default model for provider
    */
   getDefaultModel(provider) {
-    const defaults = {
-      'openai': 'gpt-3.5-turbo',
-      'groq': 'llama-3.1-8b-instant',
-      'gemini': 'gemini-1.5-flash',
-      'claude': 'claude-3-haiku-20240307',
-      'ollama': 'llama3.2:latest'
-    };
-    return defaults[provider] || 'gpt-3.5-turbo';
+    return DEFAULT_MODELS[provider] || 'gpt-3.5-turbo';
   }
 
   /**
@@ -183,13 +199,15 @@ export class ErrorHandler {
    * Calculate exponential backoff delay
    */
   calculateBackoffDelay(provider) {
-    const recentErrors = this.errorHistory.filter(e => 
-      e.provider === provider && 
-      e.error.type === 'rate_limit' &&
-      Date.now() - new Date(e.timestamp).getTime() < 300000 // Last 5 minutes
-    );
-    
-    const attemptCount = recentErrors.length;
+    const times = this.rateLimitTimes.get(provider) || [];
+
+    // Drop errors that have left the window
+    const cutoff = performance.now() - BACKOFF_WINDOW_MS;
+    let expired = 0;
+    while (expired < times.length && times[expired] <= cutoff) expired++;
+    if (expired > 0) times.splice(0, expired);
+
+    const attemptCount = times.length;
     return Math.min(1000 * Math.pow(2, attemptCount), 30000); // Max 30 seconds
   }
 
@@ -11,11 +11,55 @@
 import { messageFormatter } from './message-formatter.js';
 import { apiValidator } from './api-validator.js';
 
+// Wait-time hints in rate limit messages
+const WAIT_TIME_PATTERNS = [
+  /retry after (\d+) seconds/i,
+  /wait (\d+)s/i,
+  /retry in (\d+)/i
+];
+
+// Fixed recovery results, shared rather than rebuilt on every error - the
+// router only reads them
+const NO_RECOVERY = Object.freeze({
+  success: false,
+  action: 'retry',
+  modifications: Object.freeze({})
+});
+
+const AUTH_FAILURE = Object.freeze({
+  success: false,
+  action: 'fail',
+  error: 'Invalid API key'
+});
+
 export class ErrorRecoverySystem {
   constructor() {
     this.errorPatterns = new Map();
     this.recoveryStrategies = new Map();
     this.setupRecoveryStrategies();
+    this.buildPatternIndex();
+  }
+
+  /**
+   * Index every strategy pattern into one case-insensitive regex so an
+   * error string is scanned once instead of once per pattern. The
+   * lookahead lets matches overlap, so no pattern can hide another
+   */
+  buildPatternIndex() {
+    this.patternToStrategy = new Map();
+    const alternatives = [];
+
+    for (const [name, strategy] of this.recoveryStrategies) {
+      for (const pattern of strategy.patterns) {
+        const key = pattern.toLowerCase();
+        if (!this.patternToStrategy.has(key)) {
+          this.patternToStrategy.set(key, name);
+          alternatives.push(key.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'));
+        }
+      }
+    }
+
+    this.patternRegex = new RegExp(`(?=(${alternatives.join('|')}))`, 'gi');
   }
 
   /**
@@ -26,7 +70,7 @@ export class ErrorRecoverySystem {
     this.recoveryStrategies.set('tool_message_error', {
       patterns: ['tool_use', 'tool_result', 'tool blocks'],
       strategy: async (error, context) => {
-        console.log('🔧 Removing tool messages that cause API errors');
+        this.verboseLog(context, () => '🔧 Removing tool messages that cause API errors');
         return {
           success: true,
           action: 'retry',
@@ -42,7 +86,7 @@ export class ErrorRecoverySystem {
     this.recoveryStrategies.set('bad_request', {
       patterns: ['400', 'bad request', 'invalid request'],
       strategy: async (error, context) => {
-        console.log('🔍 Validating and fixing request format');
+        this.verboseLog(context, () => '🔍 Validating and fixing request format');
         const validated = apiValidator.validateRequest(
           context.provider,
           context.messages,
@@ -64,7 +108,7 @@ export class ErrorRecoverySystem {
       patterns: ['429', 'rate limit', 'too many requests'],
       strategy: async (error, context) => {
         const waitTime = this.extractWaitTime(error) || 10000;
-        console.log(`⏰ Rate limited - waiting ${waitTime}ms`);
+        this.verboseLog(context, () => `⏰ Rate limited - waiting ${waitTime}ms`);
         await this.sleep(waitTime);
         return {
           success: true,
@@ -80,7 +124,7 @@ export class ErrorRecoverySystem {
     this.recoveryStrategies.set('model_error', {
       patterns: ['model not found', 'invalid model', 'unknown model'],
       strategy: async (error, context) => {
-        console.log('🔄 Switching to fallback model');
+        this.verboseLog(context, () => '🔄 Switching to fallback model');
         const fallbackModel = apiValidator.getFallbackModel(context.provider);
         return {
           success: true,
@@ -96,7 +140,7 @@ export class ErrorRecoverySystem {
     this.recoveryStrategies.set('token_limit', {
       patterns: ['context length', 'token limit', 'maximum context'],
       strategy: async (error, context) => {
-        console.log('✂️ Reducing message size');
+        this.verboseLog(context, () => '✂️ Reducing message size');
         const truncated = this.truncateMessages(context.messages, 0.7);
         return {
           success: true,
@@ -116,7 +160,7 @@ export class ErrorRecoverySystem {
     this.recoveryStrategies.set('timeout', {
       patterns: ['timeout', 'timed out', 'deadline exceeded'],
       strategy: async (error, context) => {
-        console.log('⏱️ Extending timeout and simplifying request');
+        this.verboseLog(context, () => '⏱️ Extending timeout and simplifying request');
         return {
           success: true,
           action: 'retry',
@@ -136,11 +180,7 @@ export class ErrorRecoverySystem {
       patterns: ['401', 'unauthorized', 'authentication failed'],
       strategy: async (error, context) => {
         console.error('🔑 Authentication failed - check API key');
-        return {
-          success: false,
-          action: 'fail',
-          error: 'Invalid API key'
-        };
+        return AUTH_FAILURE;
       }
     });
   }
@@ -149,16 +189,15 @@ export class ErrorRecoverySystem {
    * Recover from error
    */
   async recoverFromError(error, context) {
-    const errorStr = error.toString().toLowerCase();
+    const matched = new Set();
+    for (const match of error.toString().matchAll(this.patternRegex)) {
+      matched.add(this.patternToStrategy.get(match[1].toLowerCase()));
+    }
     
-    // Find matching recovery strategy
+    // Find matching recovery strategy (registration order decides priority)
     for (const [name, strategy] of this.recoveryStrategies) {
-      const matches = strategy.patterns.some(pattern => 
-        errorStr.includes(pattern.toLowerCase())
-      );
-      
-      if (matches) {
-        console.log(`🚨 Detected ${name} - applying recovery strategy`);
+      if (matched.has(name)) {
+        this.verboseLog(context, () => `🚨 Detected ${name} - applying recovery strategy`);
         try {
           const result = await strategy.strategy(error, context);
           
@@ -175,11 +214,17 @@ export class ErrorRecoverySystem {
     }
 
     // No specific strategy found
-    return {
-      success: false,
-      action: 'retry',
-      modifications: {}
-    };
+    return NO_RECOVERY;
+  }
+
+  /**
+   * Progress messages only for verbose requests - the message is built
+   * only when it will be printed
+   */
+  verboseLog(context, buildMessage) {
+    if (context.options?.verbose) {
+      console.log(buildMessage());
+    }
   }
 
   /**
@@ -200,13 +245,7 @@ export class ErrorRecoverySystem {
    * Extract wait time from rate limit error
    */
   extractWaitTime(error) {
-    const patterns = [
-      /retry after (\d+) seconds/i,
-      /wait (\d+)s/i,
-      /retry in (\d+)/i
-    ];
-    
-    for (const pattern of patterns) {
+    for (const pattern of WAIT_TIME_PATTERNS) {
       const match = error.message?.match(pattern);
       if (match) {
         return parseInt(match[1]) * 1000;
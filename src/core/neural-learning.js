@@ -4,6 +4,22 @@ import fs from 'fs';
 import path from 'path';
 import os from 'os';
 
+// Common programming patterns (substring match)
+const CODE_PATTERNS = ['function', 'class', 'api', 'error', 'bug', 'implement', 'create', 'fix'];
+
+// All code patterns in one case-insensitive scan; the lookahead lets
+// overlapping hits through
+const CODE_PATTERN_REGEX = new RegExp(`(?=(${CODE_PATTERNS.join('|')}))`, 'gi');
+
+// Task verbs (whole-word match)
+const TASK_PATTERNS = ['explain', 'help', 'debug', 'optimize', 'refactor', 'test'];
+
+// Task verb -> bit, so a message's verbs fold into one integer mask
+const TASK_PATTERN_BITS = new Map(TASK_PATTERNS.map((pattern, i) => [pattern, 1 << i]));
+
+// Task verbs as whole whitespace-delimited words, matched in place
+const TASK_PATTERN_REGEX = new RegExp(`(?<!\\S)(${TASK_PATTERNS.join('|')})(?!\\S)`, 'gi');
+
 /**
  * Neural Learning System for Iris
  * Learns from user interactions to improve responses and performance
@@ -12,11 +28,21 @@ import os from 'os';
 export class NeuralLearningSystem {
   constructor() {
     this.learningDataPath = path.join(os.homedir(), '.iris', 'learning-data.json');
+    this.memoryLogPath = path.join(os.homedir(), '.iris', 'learning-memory.ndjson');
+    this.memoryLogLines = 0;
+    this.pendingMemoryLines = null;
+    this.memoryWrites = Promise.resolve();
     this.patterns = new Map();
     this.userPreferences = new Map();
     this.responseQuality = new Map();
+    this.qualityByTaskType = new Map();
     this.contextMemory = [];
     this.maxMemorySize = 1000;
+    this.patternCache = new Map();
+    this.maxPatternCacheSize = 500;
+    this.pendingSave = null;
+    this.saveRequested = false;
+    this.resetMemoryStats();
     
     this.loadLearningData();
   }
@@ -25,50 +51,256 @@ export class NeuralLearningSystem {
    * Load existing learning data
    */
   loadLearningData() {
+    let legacyMemory = [];
     try {
       if (fs.existsSync(this.learningDataPath)) {
         const data = JSON.parse(fs.readFileSync(this.learningDataPath, 'utf8'));
         this.patterns = new Map(data.patterns || []);
         this.userPreferences = new Map(data.preferences || []);
         this.responseQuality = new Map(data.quality || []);
-        this.contextMemory = data.memory || [];
+        this.responseQuality.forEach((performance, key) => this.indexQuality(key, performance));
+        legacyMemory = data.memory || [];
       }
     } catch (error) {
       console.log('🧠 Initializing new neural learning system');
     }
+
+    this.contextMemory = [...legacyMemory, ...this.readMemoryLog()].slice(-this.maxMemorySize);
+    this.resetMemoryStats();
+    this.contextMemory.forEach(entry => this.trackMemoryEntry(entry, 1));
+
+    // Move memory saved by older versions into the append-only log, then
+    // drop it from the learning file so the next load doesn't read it twice
+    if (legacyMemory.length > 0 && this.compactMemoryLog()) {
+      try {
+        const tempPath = `${this.learningDataPath}.tmp`;
+        fs.writeFileSync(tempPath, this.serializeLearningData());
+        fs.renameSync(tempPath, this.learningDataPath);
+      } catch (error) {
+        // Silently fail - learning is optional enhancement
+      }
+    }
   }
 
   /**
-   * Save learning data
+   * Read context memory entries from the append-only log
    */
-  saveLearningData() {
+  readMemoryLog() {
+    const entries = [];
     try {
-      const dir = path.dirname(this.learningDataPath);
-      if (!fs.existsSync(dir)) {
-        fs.mkdirSync(dir, { recursive: true });
+      if (fs.existsSync(this.memoryLogPath)) {
+        for (const line of fs.readFileSync(this.memoryLogPath, 'utf8').split('\n')) {
+          if (!line) continue;
+          try {
+            entries.push(JSON.parse(line));
+          } catch (error) {
+            // Skip a partially written line
+          }
+        }
       }
+    } catch (error) {
+      // Unreadable log - start with empty memory
+    }
+    this.memoryLogLines = entries.length;
+    return entries;
+  }
 
-      const data = {
-        patterns: Array.from(this.patterns.entries()),
-        preferences: Array.from(this.userPreferences.entries()),
-        quality: Array.from(this.responseQuality.entries()),
-        memory: this.contextMemory.slice(-this.maxMemorySize)
-      };
+  /**
+   * Append one context memory entry to the log instead of rewriting the
+   * whole learning file. The write happens off the request path; entries
+   * queued while one is in flight go out together in the next append
+   */
+  appendMemoryEntry(entry) {
+    this.memoryLogLines++;
+
+    // Rewrite with just the retained entries once the log has doubled.
+    // The snapshot already holds any lines still waiting to be appended
+    if (this.memoryLogLines > this.maxMemorySize * 2) {
+      const contents = this.contextMemory.map(retained => JSON.stringify(retained) + '\n').join('');
+      if (this.pendingMemoryLines) {
+        this.pendingMemoryLines.length = 0;
+        this.pendingMemoryLines = null;
+      }
+      this.memoryLogLines = this.contextMemory.length;
+      this.queueMemoryWrite(async () => {
+        const tempPath = `${this.memoryLogPath}.tmp`;
+        await fs.promises.writeFile(tempPath, contents);
+        await fs.promises.rename(tempPath, this.memoryLogPath);
+      });
+      return;
+    }
+
+    // Each queued append owns its batch, so lines added after a compaction
+    // was queued land after it
+    if (!this.pendingMemoryLines) {
+      const lines = this.pendingMemoryLines = [];
+      this.queueMemoryWrite(() => {
+        if (this.pendingMemoryLines === lines) this.pendingMemoryLines = null;
+        return lines.length > 0 ? fs.promises.appendFile(this.memoryLogPath, lines.join('')) : undefined;
+      });
+    }
+    this.pendingMemoryLines.push(JSON.stringify(entry) + '\n');
+  }
+
+  /**
+   * Run a memory log write after the ones already queued, so appends and
+   * compactions reach the file in order
+   */
+  queueMemoryWrite(write) {
+    this.memoryWrites = this.memoryWrites
+      .then(async () => {
+        await fs.promises.mkdir(path.dirname(this.memoryLogPath), { recursive: true });
+        await write();
+      })
+      .catch(() => {
+        // Silently fail - learning is optional enhancement
+      });
+    return this.memoryWrites;
+  }
+
+  /**
+   * Wait for queued memory log writes and any pending learning-data save
+   */
+  async flush() {
+    await this.memoryWrites;
+    // A save requested mid-write starts a follow-up once the first lands
+    while (this.pendingSave) {
+      await this.pendingSave;
+    }
+  }
 
-      fs.writeFileSync(this.learningDataPath, JSON.stringify(data, null, 2));
+  /**
+   * Rewrite the memory log with only the entries still held in memory
+   * (synchronous - used once at load, while migrating legacy memory).
+   * Returns whether the log was written
+   */
+  compactMemoryLog() {
+    try {
+      this.ensureDataDir();
+      const lines = this.contextMemory.map(entry => JSON.stringify(entry) + '\n');
+      fs.writeFileSync(this.memoryLogPath, lines.join(''));
+      this.memoryLogLines = lines.length;
+      return true;
     } catch (error) {
       // Silently fail - learning is optional enhancement
+      return false;
     }
   }
 
   /**
-   * Learn from user interaction
+   * Create the learning data directory if needed
    */
-  async learnFromInteraction(interaction) {
+  ensureDataDir() {
+    const dir = path.dirname(this.learningDataPath);
+    if (!fs.existsSync(dir)) {
+      fs.mkdirSync(dir, { recursive: true });
+    }
+  }
+
+  /**
+   * Index a provider:taskType performance record by task type, so lookups
+   * for one task type don't have to walk and re-split every key
+   */
+  indexQuality(key, performance) {
+    const [provider, taskType] = key.split(':');
+    let byProvider = this.qualityByTaskType.get(taskType);
+    if (!byProvider) {
+      byProvider = new Map();
+      this.qualityByTaskType.set(taskType, byProvider);
+    }
+    byProvider.set(provider, performance);
+  }
+
+  /**
+   * Reset running aggregates over context memory
+   */
+  resetMemoryStats() {
+    this.memoryStats = {
+      successful: 0,
+      providerCounts: {},
+      timedCount: 0,
+      timeSum: 0
+    };
+  }
+
+  /**
+   * Add (delta = 1) or remove (delta = -1) a memory entry from the running
+   * aggregates, so insights don't have to rescan the whole memory
+   */
+  trackMemoryEntry(entry, delta) {
+    const stats = this.memoryStats;
+    stats.providerCounts[entry.provider] = (stats.providerCounts[entry.provider] || 0) + delta;
+    if (entry.success) {
+      stats.successful += delta;
+      if (entry.responseTime) {
+        stats.timedCount += delta;
+        stats.timeSum += delta * entry.responseTime;
+      }
+    }
+  }
+
+  /**
+   * Learning data as written to disk. Context memory is not included - it
+   * is appended to its own log
+   */
+  serializeLearningData() {
+    const data = {
+      patterns: Array.from(this.patterns.entries()),
+      preferences: Array.from(this.userPreferences.entries()),
+      quality: Array.from(this.responseQuality.entries())
+    };
+
+    // Compact output - this file is only read back by loadLearningData
+    return JSON.stringify(data);
+  }
+
+  /**
+   * Save learning data
+   */
+  saveLearningData() {
+    // One write in flight at a time; saves requested meanwhile collapse
+    // into a single follow-up write of the latest state
+    if (this.pendingSave) {
+      this.saveRequested = true;
+      return this.pendingSave;
+    }
+
+    let json;
+    try {
+      json = this.serializeLearningData();
+    } catch (error) {
+      // Silently fail - learning is optional enhancement
+      return Promise.resolve();
+    }
+
+    // Write off the request path, via a temp file so a crash mid-write
+    // can't leave a truncated learning file behind
+    const tempPath = `${this.learningDataPath}.tmp`;
+    this.pendingSave = fs.promises.mkdir(path.dirname(this.learningDataPath), { recursive: true })
+      .then(() => fs.promises.writeFile(tempPath, json))
+      .then(() => fs.promises.rename(tempPath, this.learningDataPath))
+      .catch(() => {
+        // Silently fail - learning is optional enhancement
+      })
+      .finally(() => {
+        this.pendingSave = null;
+        if (this.saveRequested) {
+          this.saveRequested = false;
+          this.saveLearningData();
+        }
+      });
+    return this.pendingSave;
+  }
+
+  /**
+   * Learn from user interaction (synchronous - pure in-memory bookkeeping
+   * plus a queued append, so there is nothing to await)
+   */
+  learnFromInteraction(interaction) {
     const { message, response, provider, taskType, responseTime, success } = interaction;
     
-    // Extract patterns from message
-    const patterns = this.extractPatterns(message);
+    // Extract patterns from message (callers may pass them precomputed)
+    const patterns = interaction.patterns || this.extractPatterns(message);
     patterns.forEach(pattern => {
       const stats = this.patterns.get(pattern) || { count: 0, providers: {} };
       stats.count++;
@@ -76,41 +308,50 @@ export class NeuralLearningSystem {
       this.patterns.set(pattern, stats);
     });
 
-    // Track provider performance
-    const providerKey = `${provider}:${taskType}`;
-    const performance = this.responseQuality.get(providerKey) || {
-      successCount: 0,
-      failureCount: 0,
-      avgResponseTime: 0,
-      totalRequests: 0
-    };
+    // Track provider performance - looked up through the task type index,
+    // so the composite provider:taskType key is only built for new records
+    let performance = this.qualityByTaskType.get(taskType)?.get(provider);
+    if (!performance) {
+      performance = {
+        successCount: 0,
+        failureCount: 0,
+        avgResponseTime: 0,
+        totalRequests: 0
+      };
+      const providerKey = `${provider}:${taskType}`;
+      this.responseQuality.set(providerKey, performance);
+      this.indexQuality(providerKey, performance);
+    }
 
     performance.totalRequests++;
     if (success) {
+      // Incremental mean over successful requests only - failures carry no
+      // response time and must not dilute the average
       performance.successCount++;
-      performance.avgResponseTime = 
-        (performance.avgResponseTime * (performance.totalRequests - 1) + responseTime) / 
-        performance.totalRequests;
+      performance.avgResponseTime +=
+        ((responseTime || 0) - performance.avgResponseTime) / performance.successCount;
     } else {
       performance.failureCount++;
     }
 
-    this.responseQuality.set(providerKey, performance);
-
-    // Add to context memory
-    this.contextMemory.push({
-      timestamp: new Date().toISOString(),
-      message: message.substring(0, 100),
+    // Add to context memory - only the fields the aggregates and insights
+    // read; the prompt text itself is already summarized by its patterns
+    const entry = {
+      timestamp: Date.now(), // epoch ms; format only when displayed
       taskType,
       provider,
       success,
       responseTime
-    });
+    };
+    this.contextMemory.push(entry);
+    this.trackMemoryEntry(entry, 1);
 
-    // Trim memory if needed
-    if (this.contextMemory.length > this.maxMemorySize) {
-      this.contextMemory = this.contextMemory.slice(-this.maxMemorySize);
+    // Trim memory if needed - evict from the front in place rather than
+    // copying the retained entries into a new array on every interaction
+    while (this.contextMemory.length > this.maxMemorySize) {
+      this.trackMemoryEntry(this.contextMemory.shift(), -1);
     }
+    this.appendMemoryEntry(entry);
 
     // Save periodically
     if (performance.totalRequests % 10 === 0) {
@@ -119,27 +360,51 @@ export class NeuralLearningSystem {
   }
 
   /**
-   * Extract patterns from message
+   * Extract patterns from message (memoized - the same message is seen by
+   * prediction and then again by learning)
    */
   extractPatterns(message) {
+    let patterns = this.patternCache.get(message);
+    if (patterns) {
+      // Refresh recency
+      this.patternCache.delete(message);
+    } else {
+      patterns = Object.freeze(this.computePatterns(message));
+      if (this.patternCache.size >= this.maxPatternCacheSize) {
+        this.patternCache.delete(this.patternCache.keys().next().value);
+      }
+    }
+    this.patternCache.set(message, patterns);
+    return patterns;
+  }
+
+  /**
+   * Compute patterns for a message
+   */
+  computePatterns(message) {
     const patterns = [];
-    const words = message.toLowerCase().split(/\s+/);
-    
-    // Common programming patterns
-    const codePatterns = ['function', 'class', 'api', 'error', 'bug', 'implement', 'create', 'fix'];
-    const taskPatterns = ['explain', 'help', 'debug', 'optimize', 'refactor', 'test'];
-    
-    codePatterns.forEach(pattern => {
-      if (message.toLowerCase().includes(pattern)) {
+
+    // Case-insensitive regexes over the original text - no lowercased copy
+    // of the whole message; only the short matched words get lowercased
+    const codeHits = new Set();
+    for (const match of message.matchAll(CODE_PATTERN_REGEX)) {
+      codeHits.add(match[1].toLowerCase());
+    }
+    for (const pattern of CODE_PATTERNS) {
+      if (codeHits.has(pattern)) {
         patterns.push(`code:${pattern}`);
       }
-    });
+    }
 
-    taskPatterns.forEach(pattern => {
-      if (words.includes(pattern)) {
-        patterns.push(`task:${pattern}`);
+    let taskMask = 0;
+    for (const match of message.matchAll(TASK_PATTERN_REGEX)) {
+      taskMask |= TASK_PATTERN_BITS.get(match[1].toLowerCase());
+    }
+    for (let i = 0; i < TASK_PATTERNS.length; i++) {
+      if (taskMask & (1 << i)) {
+        patterns.push(`task:${TASK_PATTERNS[i]}`);
       }
-    });
+    }
 
     // Detect question patterns
     if (message.includes('?')) {
@@ -157,40 +422,51 @@ export class NeuralLearningSystem {
   /**
    * Get recommended provider based on learning
    */
-  getRecommendedProvider(message, taskType) {
-    const patterns = this.extractPatterns(message);
-    const providerScores = {};
+  getRecommendedProvider(message, taskType, patterns = this.extractPatterns(message)) {
+    const providerScores = new Map();
+    const addScore = (provider, value) => {
+      providerScores.set(provider, (providerScores.get(provider) || 0) + value);
+    };
 
     // Score based on pattern success
-    patterns.forEach(pattern => {
+    for (const pattern of patterns) {
       const stats = this.patterns.get(pattern);
       if (stats) {
-        Object.entries(stats.providers).forEach(([provider, count]) => {
-          providerScores[provider] = (providerScores[provider] || 0) + count;
-        });
+        for (const provider in stats.providers) {
+          addScore(provider, stats.providers[provider]);
+        }
       }
-    });
+    }
 
-    // Score based on provider performance
-    Object.entries(this.responseQuality).forEach(([key, performance]) => {
-      const [provider, type] = key.split(':');
-      if (type === taskType || taskType === 'balanced') {
-        const score = performance.successCount / (performance.totalRequests || 1);
-        const speedBonus = 1 / (performance.avgResponseTime || 1000);
-        providerScores[provider] = (providerScores[provider] || 0) + score + speedBonus;
-      }
-    });
+    // Score based on provider performance ('balanced' draws on every task type)
+    const scorePerformance = (performance, provider) => {
+      const score = performance.successCount / (performance.totalRequests || 1);
+      const speedBonus = 1 / (performance.avgResponseTime || 1000);
+      addScore(provider, score + speedBonus);
+    };
+    if (taskType === 'balanced') {
+      this.qualityByTaskType.forEach(byProvider => byProvider.forEach(scorePerformance));
+    } else {
+      this.qualityByTaskType.get(taskType)?.forEach(scorePerformance);
+    }
 
-    // Return top scoring provider
-    const sorted = Object.entries(providerScores).sort((a, b) => b[1] - a[1]);
-    return sorted[0]?.[0] || null;
+    // Return top scoring provider (single pass, first wins ties)
+    let best = null;
+    let bestScore = -Infinity;
+    for (const [provider, score] of providerScores) {
+      if (score > bestScore) {
+        best = provider;
+        bestScore = score;
+      }
+    }
+    return best || null;
   }
 
   /**
    * Predict best provider based on patterns
    */
-  predictBestProvider(message, taskType) {
-    return this.getRecommendedProvider(message, taskType);
+  predictBestProvider(message, taskType, patterns) {
+    return this.getRecommendedProvider(message, taskType, patterns);
   }
 
   /**
@@ -209,6 +485,7 @@ export class NeuralLearningSystem {
   learnFromError(context) {
     return this.learnFromInteraction({
       message: context.message,
+      patterns: context.patterns,
       provider: context.provider,
       taskType: context.taskType,
       success: false,
@@ -227,12 +504,9 @@ export class NeuralLearningSystem {
     };
 
     // Find most used providers
-    const providerCounts = {};
-    this.contextMemory.forEach(entry => {
-      providerCounts[entry.provider] = (providerCounts[entry.provider] || 0) + 1;
-    });
-    
+    const { providerCounts, timedCount, timeSum } = this.memoryStats;
     preferences.preferredProviders = Object.entries(providerCounts)
+      .filter(([, count]) => count > 0)
       .sort((a, b) => b[1] - a[1])
       .slice(0, 3)
       .map(([provider]) => provider);
@@ -244,13 +518,8 @@ export class NeuralLearningSystem {
       .map(([pattern]) => pattern);
 
     // Calculate average response time
-    const times = this.contextMemory
-      .filter(e => e.success && e.responseTime)
-      .map(e => e.responseTime);
-    
-    if (times.length > 0) {
-      preferences.averageResponseTime = 
-        times.reduce((a, b) => a + b, 0) / times.length;
+    if (timedCount > 0) {
+      preferences.averageResponseTime = timeSum / timedCount;
     }
 
     return preferences;
@@ -261,21 +530,23 @@ export class NeuralLearningSystem {
    */
   optimizeRequest(message, options = {}) {
     const optimized = { ...options };
+    const patterns = this.extractPatterns(message);
     
     // Get recommended provider
-    const recommended = this.getRecommendedProvider(message, options.taskType || 'balanced');
+    const recommended = this.getRecommendedProvider(message, options.taskType || 'balanced', patterns);
     if (recommended && !options.provider) {
       optimized.provider = recommended;
-      console.log(`🧠 Neural recommendation: ${recommended} provider`);
+      if (options.verbose) {
+        console.log(`🧠 Neural recommendation: ${recommended} provider`);
+      }
     }
 
     // Adjust token limits based on patterns
-    if (this.extractPatterns(message).includes('has:code')) {
+    if (patterns.includes('has:code')) {
       optimized.maxTokens = Math.min((options.maxTokens || 2000) * 1.5, 4000);
     }
 
     // Set temperature based on task type
-    const patterns = this.extractPatterns(message);
     if (patterns.includes('task:explain') || patterns.includes('task:debug')) {
       optimized.temperature = 0.3; // More focused
     } else if (patterns.includes('task:create') || patterns.includes('code:implement')) {
@@ -298,8 +569,7 @@ export class NeuralLearningSystem {
     };
 
     // Calculate success rate
-    const successful = this.contextMemory.filter(e => e.success).length;
-    insights.successRate = successful / (this.contextMemory.length || 1);
+    insights.successRate = this.memoryStats.successful / (this.contextMemory.length || 1);
 
     // Get provider performance
     this.responseQuality.forEach((perf, key) => {
@@ -0,0 +1,136 @@
+#!/usr/bin/env node
+
+import { performance } from 'perf_hooks';
+
+/**
+ * Rate Limiters
+ * Token bucket for smooth admission with bounded bursts, plus a sliding
+ * window variant for strict "no more than N in any window" caps
+ *
+ * @author Jordan After Midnight
+ * @copyright 2025 Jordan After Midnight. All rights reserved.
+ */
+
+export class TokenBucket {
+  constructor(rate, capacity = rate, intervalMs = 1000) {
+    this.capacity = Math.max(1, capacity);
+    this.refillRate = rate / intervalMs; // tokens per millisecond
+    this.tokens = this.capacity;
+    this.lastRefill = performance.now();
+  }
+
+  /**
+   * Add tokens earned since the last refill
+   */
+  refill() {
+    const now = performance.now();
+    this.tokens = Math.min(this.capacity, this.tokens + (now - this.lastRefill) * this.refillRate);
+    this.lastRefill = now;
+  }
+
+  /**
+   * Whether a request could be admitted right now
+   */
+  hasCapacity() {
+    this.refill();
+    return this.tokens >= 1;
+  }
+
+  /**
+   * Take a token if one is available
+   */
+  tryAcquire() {
+    this.refill();
+    if (this.tokens >= 1) {
+      this.tokens -= 1;
+      return true;
+    }
+    return false;
+  }
+
+  /**
+   * Give back a token taken for a request that was never sent
+   */
+  release() {
+    this.tokens = Math.min(this.capacity, this.tokens + 1);
+  }
+
+  /**
+   * Milliseconds until the next token is available
+   */
+  waitTime() {
+    this.refill();
+    return this.tokens >= 1 ? 0 : (1 - this.tokens) / this.refillRate;
+  }
+
+  /**
+   * Wait for a token, then take it
+   */
+  async acquire() {
+    while (!this.tryAcquire()) {
+      await new Promise(resolve => setTimeout(resolve, Math.ceil(this.waitTime())));
+    }
+  }
+}
+
+export class SlidingWindowLimiter {
+  constructor(limit, windowMs = 60000) {
+    this.limit = Math.max(1, limit);
+    this.windowMs = windowMs;
+    this.timestamps = [];
+  }
+
+  /**
+   * Drop admissions that have left the window
+   */
+  prune() {
+    const cutoff = performance.now() - this.windowMs;
+    let expired = 0;
+    while (expired < this.timestamps.length && this.timestamps[expired] <= cutoff) expired++;
+    if (expired > 0) this.timestamps.splice(0, expired);
+  }
+
+  hasCapacity() {
+    this.prune();
+    return this.timestamps.length < this.limit;
+  }
+
+  tryAcquire() {
+    if (!this.hasCapacity()) return false;
+    this.timestamps.push(performance.now());
+    return true;
+  }
+
+  release() {
+    this.timestamps.pop();
+  }
+
+  waitTime() {
+    return this.hasCapacity()
+      ? 0
+      : Math.max(0, this.timestamps[0] + this.windowMs - performance.now());
+  }
+
+  async acquire() {
+    while (!this.tryAcquire()) {
+      await new Promise(resolve => setTimeout(resolve, Math.ceil(this.waitTime())));
+    }
+  }
+}
+
+// Token bucket burst size, as a fraction of the per-minute quota - a full
+// minute's quota in one burst trips hard per-minute caps at window start
+const BURST_FRACTION = 1 / 6;
+
+/**
+ * Build a per-minute limiter - token bucket unless a strict window is asked
+ * for. The bucket smooths traffic but can still exceed a provider's fixed
+ * per-minute window; use 'sliding-window' for providers with hard caps
+ */
+export function createRateLimiter(requestsPerMinute, strategy = 'token-bucket') {
+  return strategy === 'sliding-window'
+    ? new SlidingWindowLimiter(requestsPerMinute, 60000)
+    : new TokenBucket(requestsPerMinute, Math.ceil(requestsPerMinute * BURST_FRACTION), 60000);
+}
+
+export default TokenBucket;
@@ -0,0 +1,215 @@
+#!/usr/bin/env node
+
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+import os from 'os';
+
+// One-shot hashing where available (Node >= 20.12) skips the Hash object
+const digest = typeof crypto.hash === 'function'
+  ? (data) => crypto.hash('sha1', data)
+  : (data) => crypto.createHash('sha1').update(data).digest('hex');
+
+// Word tokens for near-duplicate matching
+const WORD_REGEX = /\w+/g;
+
+/**
+ * Response Cache
+ * File-backed cache for chat responses keyed by a hash of the request,
+ * so repeated prompts skip the provider round-trip entirely
+ *
+ * @author Jordan After Midnight
+ * @copyright 2025 Jordan After Midnight. All rights reserved.
+ */
+
+export class ResponseCache {
+  constructor(options = {}) {
+    this.cacheDir = options.cacheDir || path.join(os.homedir(), '.iris', 'cache');
+    // Default TTL (1 hour); 0 disables caching
+    this.ttl = options.ttl ?? 60 * 60 * 1000;
+    // Per-provider TTL overrides; 0 disables caching for that provider
+    this.ttlByProvider = options.ttlByProvider || {};
+    this.maxSize = options.maxSize || 200;
+    // Near-duplicate matching: a prompt whose word overlap (Jaccard) with a
+    // cached prompt reaches this threshold reuses that entry. 0 disables it
+    this.similarityThreshold = options.similarityThreshold || 0;
+    // Word sets of keys handed out but not yet stored
+    this.pendingSignatures = new Map();
+    // In-memory LRU in front of the files: Map iteration order is insertion
+    // order, so re-inserting on access keeps the oldest entry first
+    this.memory = new Map();
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  /**
+   * Build cache key from the parts of a request that affect the response.
+   * The key is always the request's own; near-duplicate matching happens
+   * on read, in get()
+   */
+  createKey(message, options = {}) {
+    // Delimited string instead of a JSON object - the message is the only
+    // large part and goes in last, unescaped
+    const scope = `${options.taskType || 'balanced'}\0${options.provider || 'auto'}\0${options.model || 'default'}`;
+    const text = typeof message === 'string' ? message : JSON.stringify(message);
+    const key = digest(`${scope}\0${text}`).slice(0, 16);
+
+    if (this.similarityThreshold > 0 && !this.memory.has(key)) {
+      const words = new Set(text.toLowerCase().match(WORD_REGEX));
+      this.pendingSignatures.delete(key);
+      this.pendingSignatures.set(key, { scope, words });
+      if (this.pendingSignatures.size > this.maxSize) {
+        this.pendingSignatures.delete(this.pendingSignatures.keys().next().value);
+      }
+    }
+    return key;
+  }
+
+  /**
+   * Key of the unexpired in-memory entry most similar to a prompt, if
+   * similar enough
+   */
+  findSimilar(scope, words) {
+    let bestKey = null;
+    let bestScore = this.similarityThreshold;
+
+    for (const [key, entry] of this.memory) {
+      const signature = entry.signature;
+      if (!signature || signature.scope !== scope || !this.isFresh(entry)) continue;
+
+      let shared = 0;
+      for (const word of words) {
+        if (signature.words.has(word)) shared++;
+      }
+      const union = words.size + signature.words.size - shared;
+      const score = union > 0 ? shared / union : 1;
+      if (score >= bestScore) {
+        bestKey = key;
+        bestScore = score;
+      }
+    }
+    return bestKey;
+  }
+
+  /**
+   * Whether a stored entry is still within its TTL
+   */
+  isFresh(entry) {
+    return Date.now() - entry.storedAt < (entry.ttl ?? this.ttl);
+  }
+
+  /**
+   * Get cached response if present and not expired. The exact key is tried
+   * in memory and on disk first; only then a near-duplicate prompt's entry
+   */
+  get(key) {
+    const cached = this.memory.get(key);
+    if (cached) {
+      this.memory.delete(key);
+      if (this.isFresh(cached)) {
+        this.memory.set(key, cached);
+        this.hits++;
+        return cached.value;
+      }
+    }
+
+    const filePath = path.join(this.cacheDir, `${key}.json`);
+
+    try {
+      if (fs.existsSync(filePath)) {
+        const entry = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+        if (this.isFresh(entry)) {
+          this.remember(key, entry);
+          this.hits++;
+          return entry.value;
+        }
+        fs.unlinkSync(filePath);
+      }
+    } catch (error) {
+      // Corrupt or unreadable entry - treat as a miss
+    }
+
+    const signature = this.pendingSignatures.get(key);
+    const similarKey = signature && this.findSimilar(signature.scope, signature.words);
+    if (similarKey) {
+      const entry = this.memory.get(similarKey);
+      this.remember(similarKey, entry);
+      this.hits++;
+      return entry.value;
+    }
+
+    this.misses++;
+    return null;
+  }
+
+  /**
+   * Keep entry in the in-memory LRU, evicting the least recently used
+   */
+  remember(key, entry) {
+    this.memory.delete(key);
+    this.memory.set(key, entry);
+    if (this.memory.size > this.maxSize) {
+      this.memory.delete(this.memory.keys().next().value);
+    }
+  }
+
+  /**
+   * Store response in cache
+   */
+  set(key, value) {
+    // TTL follows whichever provider actually answered
+    const ttl = this.ttlByProvider[value?.provider] ?? this.ttl;
+    if (ttl <= 0) return;
+
+    const entry = { storedAt: Date.now(), ttl, value };
+    this.remember(key, entry);
+
+    try {
+      if (!fs.existsSync(this.cacheDir)) {
+        fs.mkdirSync(this.cacheDir, { recursive: true });
+      }
+      fs.writeFileSync(
+        path.join(this.cacheDir, `${key}.json`),
+        JSON.stringify(entry)
+      );
+
+    } catch (error) {
+      // Silently fail - caching is optional enhancement
+    }
+
+    // Word set is kept in memory only, after the entry is written out
+    const signature = this.pendingSignatures.get(key);
+    if (signature) {
+      this.pendingSignatures.delete(key);
+      entry.signature = signature;
+    }
+  }
+
+  /**
+   * Remove all cached responses
+   */
+  clear() {
+    this.memory.clear();
+    this.pendingSignatures.clear();
+    try {
+      fs.rmSync(this.cacheDir, { recursive: true, force: true });
+    } catch (error) {
+      // Nothing to clear
+    }
+  }
+
+  /**
+   * Get cache statistics
+   */
+  getStats() {
+    const total = this.hits + this.misses;
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      memoryEntries: this.memory.size,
+      hitRate: total > 0 ? this.hits / total : 0
+    };
+  }
+}
+
+export default ResponseCache;
@@ -1,6 +1,6 @@
 #!/usr/bin/env node
 
-import { NeuralLearningSystem } from './neural-learning.js';
+import { neuralLearning } from './neural-learning.js';
 
 /**
  * Self-Healing Error Handler for IRIS
@@ -11,7 +11,7 @@ import { NeuralLearningSystem } from './neural-learning.js';
  */
 export class SelfHealingHandler {
   constructor() {
-    this.neuralSystem = new NeuralLearningSystem();
+    this.neuralSystem = neuralLearning;
     this.healingStrategies = new Map();
     this.initializeStrategies();
   }
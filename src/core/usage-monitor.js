@@ -15,6 +15,7 @@ import crypto from 'crypto';
 export class UsageMonitor {
   constructor() {
     this.logFile = path.join(process.cwd(), '.usage-log');
+    this.anomalyFile = path.join(process.cwd(), '.anomalies');
     this.maxLogSize = 10 * 1024 * 1024; // 10MB
     this.suspiciousPatterns = [
       // Automated usage patterns
@@ -26,30 +27,55 @@ export class UsageMonitor {
       // Commercial usage without license
       /(production|enterprise|commercial|business)/i
     ];
+
+    // Recent-request window kept in memory as parallel columns, so anomaly
+    // checks don't re-read and re-parse the whole log on every request
+    this.windowMs = 24 * 60 * 60 * 1000;
+    this.windowTimes = [];
+    this.windowMessages = [];
+    this.windowStart = 0;
+    this.messageCounts = new Map();
+    this.windowLoaded = false;
+
+    // Process identity doesn't change while running, so it is gathered once
+    // rather than re-read from the environment for every logged request
+    this.processInfo = {
+      pid: process.pid,
+      ppid: process.ppid,
+      user: process.env.USER || process.env.USERNAME || 'unknown',
+      cwd: process.cwd(),
+      args: process.argv.slice(2)
+    };
+    // ...and serialized once too; each log line only encodes what changes
+    this.processInfoJSON = JSON.stringify(this.processInfo).slice(1, -1);
   }
 
   /**
    * Log usage event
    */
   logUsage(event) {
+    const now = Date.now();
     const logEntry = {
-      timestamp: new Date().toISOString(),
-      pid: process.pid,
-      ppid: process.ppid,
-      user: process.env.USER || process.env.USERNAME || 'unknown',
-      cwd: process.cwd(),
-      args: process.argv.slice(2),
+      timestamp: new Date(now).toISOString(),
+      ...this.processInfo,
       ...event
     };
 
     try {
       // Rotate log if too large
       this.rotateLogIfNeeded();
+
+      // Track in the recent window (seeds from the existing log first)
+      this.recordInWindow(now, logEntry.message);
       
-      // Append to log
+      // Append to log. Same line as JSON.stringify(logEntry), with the
+      // static process fields spliced in pre-encoded; event keys come last
+      // and win on parse, as they do in the spread above
+      const eventJSON = JSON.stringify(event);
       fs.appendFileSync(
         this.logFile, 
-        JSON.stringify(logEntry) + '\n'
+        `{"timestamp":"${logEntry.timestamp}",${this.processInfoJSON}${
+          eventJSON === '{}' ? '}' : `,${eventJSON.slice(1)}`}\n`
       );
 
       // Check for suspicious patterns
@@ -61,6 +87,59 @@ export class UsageMonitor {
     }
   }
 
+  /**
+   * Seed the in-memory window from the log file (once per process)
+   */
+  loadWindow() {
+    this.windowLoaded = true;
+    for (const entry of this.getRecentRequests(this.windowMs)) {
+      this.recordInWindow(new Date(entry.timestamp).getTime(), entry.message);
+    }
+  }
+
+  /**
+   * Add a request to the in-memory window and evict expired entries
+   */
+  recordInWindow(time, message) {
+    if (!this.windowLoaded) this.loadWindow();
+
+    this.windowTimes.push(time);
+    this.windowMessages.push(message);
+    if (message) {
+      this.messageCounts.set(message, (this.messageCounts.get(message) || 0) + 1);
+    }
+
+    const cutoff = time - this.windowMs;
+    while (this.windowStart < this.windowTimes.length && this.windowTimes[this.windowStart] <= cutoff) {
+      const expired = this.windowMessages[this.windowStart];
+      if (expired) {
+        const count = this.messageCounts.get(expired) - 1;
+        if (count > 0) this.messageCounts.set(expired, count);
+        else this.messageCounts.delete(expired);
+      }
+      this.windowStart++;
+    }
+
+    // Compact once the evicted prefix dominates the columns
+    if (this.windowStart > 1024 && this.windowStart * 2 > this.windowTimes.length) {
+      this.windowTimes = this.windowTimes.slice(this.windowStart);
+      this.windowMessages = this.windowMessages.slice(this.windowStart);
+      this.windowStart = 0;
+    }
+  }
+
+  /**
+   * Count requests in the in-memory window newer than timeWindowMs
+   */
+  countRecentRequests(timeWindowMs) {
+    const cutoff = Date.now() - timeWindowMs;
+    let count = 0;
+    for (let i = this.windowTimes.length - 1; i >= this.windowStart && this.windowTimes[i] > cutoff; i--) {
+      count++;
+    }
+    return count;
+  }
+
   /**
    * Rotate log file if it exceeds size limit
    */
@@ -98,11 +177,11 @@ export class UsageMonitor {
     }
 
     // Check for rapid requests (potential automation)
-    const recentRequests = this.getRecentRequests(60000); // Last minute
-    if (recentRequests.length > 20) {
+    const recentCount = this.countRecentRequests(60000); // Last minute
+    if (recentCount > 20) {
       anomalies.push({
         type: 'high_frequency',
-        count: recentRequests.length,
+        count: recentCount,
         timeframe: '1 minute',
         confidence: 0.9
       });
@@ -149,13 +228,10 @@ export class UsageMonitor {
    */
   countDuplicateRequests(message) {
     if (!message) return 0;
+    if (!this.windowLoaded) this.loadWindow();
 
-    try {
-      const recentLogs = this.getRecentRequests(24 * 60 * 60 * 1000); // Last 24 hours
-      return recentLogs.filter(entry => entry.message === message).length;
-    } catch (error) {
-      return 0;
-    }
+    // Last 24 hours, from the in-memory window
+    return this.messageCounts.get(message) || 0;
   }
 
   /**
@@ -178,9 +254,8 @@ export class UsageMonitor {
     // Anomaly detected - logging for analysis
 
     // Log to anomaly file
-    const anomalyFile = path.join(process.cwd(), '.anomalies');
     try {
-      fs.appendFileSync(anomalyFile, JSON.stringify(report) + '\n');
+      fs.appendFileSync(this.anomalyFile, JSON.stringify(report) + '\n');
     } catch (error) {
       // Silent fail
     }
@@ -230,10 +305,9 @@ export class UsageMonitor {
    */
   getAnomalyCount() {
     try {
-      const anomalyFile = path.join(process.cwd(), '.anomalies');
-      if (!fs.existsSync(anomalyFile)) return 0;
+      if (!fs.existsSync(this.anomalyFile)) return 0;
 
-      return fs.readFileSync(anomalyFile, 'utf8')
+      return fs.readFileSync(this.anomalyFile, 'utf8')
         .split('\n')
         .filter(line => line.trim()).length;
     } catch (error) {
@@ -255,12 +329,23 @@ export class UsageMonitor {
     });
 
     return {
-      peakHour: hourlyDistribution.indexOf(Math.max(...hourlyDistribution)),
-      peakDay: dailyDistribution.indexOf(Math.max(...dailyDistribution)),
+      peakHour: this.indexOfMax(hourlyDistribution),
+      peakDay: this.indexOfMax(dailyDistribution),
       hourlyDistribution,
       dailyDistribution
     };
   }
+
+  /**
+   * Index of the largest value, found in a single pass
+   */
+  indexOfMax(values) {
+    let maxIndex = 0;
+    for (let i = 1; i < values.length; i++) {
+      if (values[i] > values[maxIndex]) maxIndex = i;
+    }
+    return maxIndex;
+  }
 }
 
 // Export singleton instance
@@ -4,14 +4,47 @@ import fs from 'fs';
 import path from 'path';
 import { AIRouter } from './core/ai-router.js';
 import { OllamaProvider } from './providers/ollama-provider.js';
-import { GeminiProvider } from './providers/gemini-provider.js';
-import { ClaudeProvider } from './providers/claude-provider.js';
-import { OpenAIProvider } from './providers/openai-provider.js';
-import { GroqProvider } from './providers/groq-provider.js';
 import { HuggingFaceProvider } from './providers/huggingface-provider.js';
 import { TogetherProvider } from './providers/together-provider.js';
 import { CohereProvider } from './providers/cohere-provider.js';
 import { BuiltinProvider } from './providers/builtin-provider.js';
+import { ResponseCache } from './core/response-cache.js';
+import { ConcurrencyLimiter } from './core/concurrency-limiter.js';
+import { TokenBucket, createRateLimiter } from './core/rate-limiter.js';
+import { neuralLearning } from './core/neural-learning.js';
+
+// Complexity indicators and secret redaction, compiled once. Technical
+// (group 1) and multi-part (group 2) terms share one regex, so a message
+// is scanned once for both
+const COMPLEXITY_TERMS = /\b(?:(algorithm|architecture|design pattern|optimization|performance|security|database|api|framework)|(step by step|analyze|compare|evaluate|research|comprehensive|detailed))\b/gi;
+const SECRET_PATTERN = /(?:api[_\s]*key|token|password)[=:\s]*[^\s&]+/gi;
+
+// Task types that add to a request's complexity score
+const COMPLEX_TASKS = new Set(['complex', 'analysis', 'code']);
+
+// Message validation failures
+const INVALID_MESSAGE = 'Message must be a non-empty string';
+const MESSAGE_TOO_LONG = 'Message too long (maximum 10,000 characters)';
+
+// Logging thresholds; messages below the configured level are never built
+const LOG_LEVELS = { debug: 0, info: 1, warn: 2, error: 3 };
+
+// Status badges used by displayProviderStatus
+const STATUS_ICONS = { error: '❌', no_api_key: '🔑' };
+
+// Padded display labels, computed once per provider name
+const providerLabels = new Map();
+function providerLabel(name) {
+  let label = providerLabels.get(name);
+  if (!label) {
+    label = name.toUpperCase().padEnd(8);
+    providerLabels.set(name, label);
+  }
+  return label;
+}
+
+// Parsed config files by absolute path, with the mtime they were read at
+const configFileCache = new Map();
 
 /**
  * Iris - Integrated Runtime Intelligence Service
@@ -23,10 +56,24 @@ import { BuiltinProvider } from './providers/builtin-provider.js';
  */
 export class MultiAI {
   constructor(options = {}) {
-    this.router = new AIRouter();
+    this.config = this.loadConfig(options.configPath);
+    this.router = new AIRouter({
+      maxConcurrentRequests: this.config.performance?.maxConcurrentRequests,
+      maxQueuedRequests: this.config.performance?.maxQueuedRequests,
+      availabilityTTL: this.config.performance?.availabilityTTL
+    });
+    this.responseCache = new ResponseCache({
+      ttl: this.config.performance?.cacheTTL,
+      ttlByProvider: this.config.performance?.cacheTTLByProvider,
+      similarityThreshold: this.config.performance?.cacheSimilarityThreshold
+    });
+    this.inflight = new Map();
+    // IRIS_LOG_LEVEL overrides the config, e.g. 'warn' to skip progress output
+    const logLevel = process.env.IRIS_LOG_LEVEL || this.config.logging?.level;
+    this.logLevel = LOG_LEVELS[logLevel] ?? LOG_LEVELS.info;
+    this.debug = this.logLevel <= LOG_LEVELS.debug;
     this.context = [];
     this.knowledgeBase = new Map();
-    this.config = this.loadConfig(options.configPath);
     this.initialized = false;
     this.providerStatus = {
       ollama: { available: false, status: 'unknown', priority: 1 },
@@ -47,17 +94,18 @@ export class MultiAI {
   async initializeProviders(options = {}) {
     if (this.initialized) return this.getProviderStatus();
     
-    console.log('🚀 Initializing AI providers...');
+    this.infoLog(() => '🚀 Initializing AI providers...');
     
     try {
-      // Always initialize Ollama/Mistral first (primary provider)
-      await this.initializeOllama(options);
-      
-      // Initialize free local providers (no API keys needed)
-      await this.initializeFreeProviders(options);
-      
-      // Initialize optional providers silently
-      await this.initializeOptionalProviders(options);
+      // Ollama/Mistral (primary provider), free local providers (no API
+      // keys needed) and optional providers are independent, so their
+      // availability probes run together - startup waits for the slowest
+      // probe instead of the sum of all of them
+      await Promise.all([
+        this.initializeOllama(options),
+        this.initializeFreeProviders(options),
+        this.initializeOptionalProviders(options)
+      ]);
       
       // Set fallback order prioritizing cost efficiency and performance
       this.router.setFallbackOrder(['ollama', 'groq', 'huggingface', 'openai', 'gemini', 'together', 'cohere', 'claude', 'builtin']);
@@ -77,13 +125,17 @@ export class MultiAI {
   async initializeOllama(options = {}) {
     try {
       const ollamaProvider = new OllamaProvider({
-        host: options.ollamaHost || this.config.providers?.ollama?.host
+        host: options.ollamaHost || this.config.providers?.ollama?.host,
+        batchWindowMs: this.config.providers?.ollama?.batchWindowMs,
+        maxConcurrentGenerations: this.config.providers?.ollama?.maxConcurrentGenerations,
+        debug: this.debug,
+        fetch: options.ollamaFetch || options.fetch
       });
       ollamaProvider.priority = 1;
       this.router.registerProvider(ollamaProvider);
       
       // Test availability
-      const isAvailable = await ollamaProvider.isAvailable();
+      const isAvailable = await this.router.checkAvailability(ollamaProvider);
       this.providerStatus.ollama = {
         available: isAvailable,
         status: isAvailable ? 'healthy' : 'unavailable',
@@ -93,7 +145,7 @@ export class MultiAI {
       };
       
       if (isAvailable) {
-        console.log('✅ Mistral (Ollama) ready - primary provider active');
+        this.infoLog(() => '✅ Mistral (Ollama) ready - primary provider active');
       } else {
         console.warn('⚠️  Mistral (Ollama) unavailable - fallback providers will be used');
       }
@@ -113,7 +165,7 @@ export class MultiAI {
       hfProvider.priority = 3;
       this.router.registerProvider(hfProvider);
       
-      const isAvailable = await hfProvider.isAvailable();
+      const isAvailable = await this.router.checkAvailability(hfProvider);
       this.providerStatus.huggingface = {
         available: isAvailable,
         status: isAvailable ? 'healthy' : 'install needed',
@@ -124,7 +176,7 @@ export class MultiAI {
       };
       
       if (isAvailable) {
-        console.log('✅ HuggingFace Transformers ready - local models available');
+        this.infoLog(() => '✅ HuggingFace Transformers ready - local models available');
       }
     } catch (error) {
       this.providerStatus.huggingface = {
@@ -152,7 +204,7 @@ export class MultiAI {
         description: 'Built-in fallback responses'
       };
       
-      console.log('✅ Built-in Provider ready - always available fallback');
+      this.infoLog(() => '✅ Built-in Provider ready - always available fallback');
     } catch (error) {
       // This should never fail, but just in case
       console.warn('⚠️  Built-in provider failed:', error.message);
@@ -163,52 +215,66 @@ export class MultiAI {
    * Initialize optional providers (Gemini, Claude)
    */
   async initializeOptionalProviders(options = {}) {
-    // Initialize Groq if API key available (fastest responses)
-    await this.initializeProvider('groq', GroqProvider, 'GROQ_API_KEY', {
-      priority: 2,
-      type: 'cloud',
-      cost: 'low',
-      description: 'Ultra-fast inference'
-    });
-
-    // Initialize OpenAI if API key available (best reasoning)
-    await this.initializeProvider('openai', OpenAIProvider, 'OPENAI_API_KEY', {
-      priority: 3,
-      type: 'cloud', 
-      cost: 'medium',
-      description: 'Advanced reasoning with o1 models'
-    });
-
-    // Initialize Gemini if API key available
-    await this.initializeProvider('gemini', GeminiProvider, 'GEMINI_API_KEY', {
-      priority: 4,
-      type: 'cloud',
-      cost: 'medium',
-      description: 'Google\'s multimodal AI'
-    });
-
-    // Initialize Claude if API key available
-    await this.initializeProvider('claude', ClaudeProvider, 'ANTHROPIC_API_KEY', {
-      priority: 5,
-      type: 'cloud',
-      cost: 'high',
-      description: 'Anthropic\'s reasoning AI'
-    });
+    // Availability checks are network round-trips, so run them together.
+    // Provider modules are loaded lazily - a cloud SDK is only imported
+    // once its API key is set
+    await Promise.all([
+      // Groq if API key available (fastest responses)
+      this.initializeProvider('groq', () => import('./providers/groq-provider.js'), 'GROQ_API_KEY', {
+        priority: 2,
+        type: 'cloud',
+        cost: 'low',
+        description: 'Ultra-fast inference'
+      }, options),
+
+      // OpenAI if API key available (best reasoning)
+      this.initializeProvider('openai', () => import('./providers/openai-provider.js'), 'OPENAI_API_KEY', {
+        priority: 3,
+        type: 'cloud', 
+        cost: 'medium',
+        description: 'Advanced reasoning with o1 models'
+      }, options),
+
+      // Gemini if API key available
+      this.initializeProvider('gemini', () => import('./providers/gemini-provider.js'), 'GEMINI_API_KEY', {
+        priority: 4,
+        type: 'cloud',
+        cost: 'medium',
+        description: 'Google\'s multimodal AI'
+      }, options),
+
+      // Claude if API key available
+      this.initializeProvider('claude', () => import('./providers/claude-provider.js'), 'ANTHROPIC_API_KEY', {
+        priority: 5,
+        type: 'cloud',
+        cost: 'high',
+        description: 'Anthropic\'s reasoning AI'
+      }, options)
+    ]);
   }
 
   /**
    * Generic provider initialization with robust error handling
    */
-  async initializeProvider(name, ProviderClass, envKey, config) {
+  async initializeProvider(name, loadModule, envKey, config, options = {}) {
     const apiKey = process.env[envKey] || this.config.providers?.[name]?.apiKey;
     
     if (apiKey) {
       try {
-        const provider = new ProviderClass({ apiKey });
+        const { default: ProviderClass } = await loadModule();
+        const provider = new ProviderClass({ apiKey, fetch: options.fetch });
         provider.priority = config.priority;
         this.router.registerProvider(provider);
+
+        const rateLimit = this.config.providers?.[name]?.rateLimit;
+        if (rateLimit?.requestsPerMinute) {
+          this.router.setRateLimit(name, createRateLimiter(
+            rateLimit.requestsPerMinute,
+            this.config.performance?.rateLimitStrategy
+          ));
+        }
         
-        const isAvailable = await provider.isAvailable();
+        const isAvailable = await this.router.checkAvailability(provider);
         this.providerStatus[name] = {
           available: isAvailable,
           status: isAvailable ? 'healthy' : 'unavailable',
@@ -219,7 +285,7 @@ export class MultiAI {
         };
         
         if (isAvailable && name !== 'ollama') {
-          console.log(`✅ ${name.toUpperCase()} ready - ${config.description}`);
+          this.infoLog(() => `✅ ${name.toUpperCase()} ready - ${config.description}`);
         }
       } catch (error) {
         this.providerStatus[name] = {
@@ -253,11 +319,25 @@ export class MultiAI {
   getProviderStatus() {
     return {
       ...this.providerStatus,
-      summary: {
-        total: Object.keys(this.providerStatus).length,
-        available: Object.values(this.providerStatus).filter(p => p.available).length,
-        primary: this.providerStatus.ollama.available ? 'mistral' : 'fallback'
-      }
+      summary: this.summarizeProviderStatus()
+    };
+  }
+
+  /**
+   * Count total and available providers in a single pass
+   */
+  summarizeProviderStatus() {
+    let total = 0;
+    let available = 0;
+    for (const name in this.providerStatus) {
+      total++;
+      if (this.providerStatus[name].available) available++;
+    }
+
+    return {
+      total,
+      available,
+      primary: this.providerStatus.ollama.available ? 'mistral' : 'fallback'
     };
   }
 
@@ -265,11 +345,11 @@ export class MultiAI {
    * Display visual status of all providers
    */
   displayProviderStatus() {
-    console.log('\n📊 Provider Status:');
+    // Build the whole table and write it once instead of one write per line
+    const lines = ['\n📊 Provider Status:'];
     
     for (const [name, status] of Object.entries(this.providerStatus)) {
-      const icon = status.available ? '✅' : (status.status === 'error' ? '❌' : 
-                  (status.status === 'no_api_key' ? '🔑' : '⚠️'));
+      const icon = status.available ? '✅' : (STATUS_ICONS[status.status] || '⚠️');
       const costBadge = status.cost === 'free' ? '🆓' : '💰';
       const typeBadge = status.type === 'local' ? '🏠' : '☁️';
       
@@ -278,22 +358,23 @@ export class MultiAI {
         statusText = 'needs API key';
       }
       
-      console.log(`${icon} ${name.toUpperCase().padEnd(8)} ${typeBadge} ${costBadge} Priority: ${status.priority} - ${statusText}`);
+      lines.push(`${icon} ${providerLabel(name)} ${typeBadge} ${costBadge} Priority: ${status.priority} - ${statusText}`);
       
       if (status.message) {
-        console.log(`   💡 ${status.message}`);
+        lines.push(`   💡 ${status.message}`);
       }
     }
     
-    const summary = this.getProviderStatus().summary;
-    console.log(`\n📈 Summary: ${summary.available}/${summary.total} providers available`);
-    console.log(`🎯 Primary: ${summary.primary === 'mistral' ? 'Mistral (cost-optimized)' : 'Fallback providers'}\n`);
+    const summary = this.summarizeProviderStatus();
+    lines.push(`\n📈 Summary: ${summary.available}/${summary.total} providers available`);
+    lines.push(`🎯 Primary: ${summary.primary === 'mistral' ? 'Mistral (cost-optimized)' : 'Fallback providers'}\n`);
+    console.log(lines.join('\n'));
   }
 
   /**
    * Mistral-first decision logic for task handling
    */
-  async shouldUseMistral(message, options = {}) {
+  shouldUseMistral(message, options = {}) {
     if (!this.providerStatus.ollama.available) {
       return { useMistral: false, reason: 'Mistral unavailable' };
     }
@@ -325,63 +406,168 @@ export class MultiAI {
   assessComplexity(message, options = {}) {
     let complexity = 0.3; // Base complexity
 
-    // Technical indicators
-    if (/\b(algorithm|architecture|design pattern|optimization|performance|security|database|api|framework)\b/i.test(message)) {
-      complexity += 0.2;
-    }
+    // Cheap checks first; the regex scans over the message are skipped
+    // once the score has already hit the cap
 
     // Length factor
     if (message.length > 5000) complexity += 0.2;
     if (message.length > 10000) complexity += 0.3;
 
     // Task type factor
-    const complexTasks = ['complex', 'analysis', 'code'];
-    if (complexTasks.includes(options.taskType)) {
+    if (COMPLEX_TASKS.has(options.taskType)) {
       complexity += 0.3;
     }
 
-    // Multi-part indicators
-    if (/\b(step by step|analyze|compare|evaluate|research|comprehensive|detailed)\b/i.test(message)) {
+    // Technical and multi-part indicators, in a single pass that stops
+    // once both kinds have been seen
+    let technical = false;
+    let multiPart = false;
+    if (complexity < 1.0) {
+      for (const match of message.matchAll(COMPLEXITY_TERMS)) {
+        if (match[1]) technical = true;
+        else multiPart = true;
+        if (technical && multiPart) break;
+      }
+    }
+
+    if (technical) {
+      complexity += 0.2;
+    }
+
+    if (multiPart && complexity < 1.0) {
       complexity += 0.2;
     }
 
     return Math.min(complexity, 1.0);
   }
 
+  /**
+   * Progress messages, skipped (and never built) above info level
+   */
+  infoLog(buildMessage) {
+    if (this.logLevel <= LOG_LEVELS.info) {
+      console.log(buildMessage());
+    }
+  }
+
+  /**
+   * Per-request routing details, shown at debug level or with --verbose.
+   * The message is only built when it will be printed
+   */
+  debugLog(options, buildMessage) {
+    if (this.debug || options.verbose) {
+      console.log(buildMessage());
+    }
+  }
+
   /**
    * Sanitize error messages to remove sensitive information
    */
   sanitizeError(message) {
-    return message.replace(/(?:api[_\s]*key|token|password)[=:\s]*[^\s&]+/gi, '[REDACTED]');
+    return message.replace(SECRET_PATTERN, '[REDACTED]');
   }
 
   /**
    * Enhanced chat with Mistral-first decision logic
    */
   async chat(message, options = {}) {
+    this.validateMessage(message);
+
+    // Serve repeated prompts from the response cache when enabled. Hits
+    // return before provider initialization - they never need a provider
+    const cacheKey = this.cacheKeyFor(message, options);
+    const cached = cacheKey && this.fromCache(message, cacheKey);
+    if (cached) {
+      return cached;
+    }
+
     // Ensure providers are initialized
     if (!this.initialized) {
       await this.initializeProviders(options);
     }
 
-    // Input validation
-    if (!message || typeof message !== 'string') {
-      throw new Error('Message must be a non-empty string');
+    return cacheKey
+      ? this.chatShared(message, options, cacheKey)
+      : this.chatUncached(message, options, null);
+  }
+
+  /**
+   * Reject messages that are empty, not strings or too long
+   */
+  validateMessage(message) {
+    const invalid = this.messageError(message);
+    if (invalid) {
+      throw new Error(invalid);
     }
-    
-    if (message.length > 10000) {
-      throw new Error('Message too long (maximum 10,000 characters)');
+  }
+
+  /**
+   * Why a message is invalid, or null - no Error is built for callers that
+   * only report the reason
+   */
+  messageError(message) {
+    if (!message || typeof message !== 'string') return INVALID_MESSAGE;
+    if (message.length > 10000) return MESSAGE_TOO_LONG;
+    return null;
+  }
+
+  /**
+   * Response cache key for a request, or null when it should not be cached
+   */
+  cacheKeyFor(message, options) {
+    const useCache = !options.stream && !options.bypassCache &&
+      (options.cache ?? this.config.performance?.cacheEnabled);
+    return useCache ? this.responseCache.createKey(message, options) : null;
+  }
+
+  /**
+   * Cached response for a request, or null on a miss
+   */
+  fromCache(message, cacheKey) {
+    const cached = this.responseCache.get(cacheKey);
+    if (!cached) return null;
+
+    this.updateContext(message, cached.response);
+    return { ...cached, contextLength: this.context.length, cached: true };
+  }
+
+  /**
+   * Chat for a cacheable request, sharing any identical one already in flight
+   */
+  async chatShared(message, options, cacheKey) {
+    // Identical request already in flight - share its result instead of
+    // sending the same prompt to a provider again
+    const pending = this.inflight.get(cacheKey);
+    if (pending) {
+      const shared = await pending;
+      this.updateContext(message, shared.response);
+      return { ...shared, contextLength: this.context.length, deduplicated: true };
+    }
+
+    const request = this.chatUncached(message, options, cacheKey);
+    this.inflight.set(cacheKey, request);
+    try {
+      return await request;
+    } finally {
+      this.inflight.delete(cacheKey);
     }
+  }
 
+  /**
+   * Chat without consulting the cache (result is stored when cacheKey is set)
+   */
+  async chatUncached(message, options, cacheKey) {
     // Check if a specific provider is forced
     if (options.provider) {
-      return await this.chatWithProvider(message, options.provider, options);
+      const result = await this.chatWithProvider(message, options.provider, options);
+      if (cacheKey) this.responseCache.set(cacheKey, result);
+      return result;
     }
 
     try {
       // Mistral-first decision logic
-      const decision = await this.shouldUseMistral(message, options);
-      console.log(`🤖 Decision: ${decision.reason}`);
+      const decision = this.shouldUseMistral(message, options);
+      this.debugLog(options, () => `🤖 Decision: ${decision.reason}`);
 
       if (decision.split) {
         return await this.handleLargeTask(message, options);
@@ -398,12 +584,15 @@ export class MultiAI {
       // Update conversation context
       this.updateContext(message, result.response);
 
-      return {
+      const response = {
         ...result,
         contextLength: this.context.length,
         decision: decision,
         sanitized: true
       };
+      if (cacheKey) this.responseCache.set(cacheKey, response);
+
+      return response;
 
     } catch (error) {
       console.error('💬 Chat error:', this.sanitizeError(error.message));
@@ -411,11 +600,68 @@ export class MultiAI {
     }
   }
 
+  /**
+   * Send several independent messages with bounded concurrency
+   */
+  async chatBatch(messages, options = {}) {
+    if (!Array.isArray(messages)) {
+      throw new Error('Messages must be an array');
+    }
+
+    // Initialized on the first cache miss, once for the whole batch
+    let initializing = null;
+
+    const { maxConcurrency, rateLimitRps, rateLimitBurst, ...chatOptions } = options;
+    const limiter = new ConcurrencyLimiter(
+      maxConcurrency || this.config.performance?.maxConcurrentRequests || 5
+    );
+    // Token bucket: average rate of rateLimitRps, bursts up to rateLimitBurst
+    const bucket = rateLimitRps ? new TokenBucket(rateLimitRps, rateLimitBurst || 1) : null;
+
+    // Identical messages in the batch are sent once and share the result
+    const unique = [...new Set(messages)];
+    const results = await limiter.map(unique, async (message) => {
+      // Invalid messages are reported directly - nothing to sanitize
+      const invalid = this.messageError(message);
+      if (invalid) {
+        return { success: false, error: invalid };
+      }
+
+      try {
+
+        // Cache hits are answered locally without spending a rate-limit token
+        const cacheKey = this.cacheKeyFor(message, chatOptions);
+        const cached = cacheKey && this.fromCache(message, cacheKey);
+        if (cached) {
+          return { success: true, ...cached };
+        }
+
+        if (!this.initialized) {
+          await (initializing ??= this.initializeProviders(options));
+        }
+
+        if (bucket) {
+          await bucket.acquire();
+        }
+
+        const result = cacheKey
+          ? await this.chatShared(message, { ...chatOptions }, cacheKey)
+          : await this.chatUncached(message, { ...chatOptions }, null);
+        return { success: true, ...result };
+      } catch (error) {
+        return { success: false, error: this.sanitizeError(error.message) };
+      }
+    });
+
+    const byMessage = new Map(unique.map((message, i) => [message, results[i]]));
+    return messages.map(message => ({ ...byMessage.get(message) }));
+  }
+
   /**
    * Handle large tasks with potential workload splitting
    */
   async handleLargeTask(message, options = {}) {
-    console.log('📊 Analyzing large task for potential splitting...');
+    this.infoLog(() => '📊 Analyzing large task for potential splitting...');
     
     // For now, try with Mistral first, then fallback
     try {
@@ -425,10 +671,10 @@ export class MultiAI {
         taskType: options.taskType || 'balanced'
       });
       
-      console.log('✅ Mistral handled large task successfully');
+      this.infoLog(() => '✅ Mistral handled large task successfully');
       return result;
     } catch (error) {
-      console.log('🔄 Large task failed on Mistral, using specialized provider...');
+      this.infoLog(() => '🔄 Large task failed on Mistral, using specialized provider...');
       
       return await this.router.executeRequest(message, {
         ...options,
@@ -448,17 +694,26 @@ export class MultiAI {
       throw new Error(`Provider '${providerName}' not found. Available providers: ${Array.from(this.router.providers.keys()).join(', ')}`);
     }
 
-    const isAvailable = await provider.isAvailable();
-    if (!isAvailable) {
+    // No availability pre-flight: for cloud providers it is itself a full
+    // API round-trip, and a down provider fails the chat call anyway. A
+    // provider already known to be down is refused without a chat attempt
+    if (this.router.cachedAvailability(providerName) === false) {
       throw new Error(`Provider '${providerName}' is not available. Check configuration and API keys.`);
     }
-
-    console.log(`🎯 Forcing provider: ${providerName}`);
+    // Forced requests count against the provider's quota like routed ones
+    const rateLimiter = this.router.rateLimiters.get(providerName);
+    if (rateLimiter && !rateLimiter.tryAcquire()) {
+      throw new Error(`Provider '${providerName}' is rate limited - retry in ${Math.ceil(rateLimiter.waitTime() / 1000)}s`);
+    }
+    this.debugLog(options, () => `🎯 Forcing provider: ${providerName}`);
 
     try {
-      const startTime = Date.now();
-      const result = await provider.chat(message, options);
-      const responseTime = Date.now() - startTime;
+      // Same concurrency cap as routed requests
+      const { result, responseTime } = await this.router.limiter.run(async () => {
+        const startTime = performance.now();
+        const result = await provider.chat(message, options);
+        return { result, responseTime: Math.round(performance.now() - startTime) };
+      });
 
       // Update provider statistics
       this.router.updateProviderStats(providerName, true, responseTime, result.usage?.cost || 0);
@@ -475,6 +730,20 @@ export class MultiAI {
       };
 
     } catch (error) {
+      // Local queue full - not the provider's fault, so no failure is
+      // recorded, and the unused rate limit token goes back
+      if (error.code === 'QUEUE_FULL') {
+        rateLimiter?.release();
+        throw error;
+      }
+
+      // Availability is only consulted to explain a failure. An unavailable
+      // (e.g. unconfigured) provider is not charged with a failure
+      const isAvailable = await this.router.checkAvailability(provider).catch(() => false);
+      if (!isAvailable) {
+        throw new Error(`Provider '${providerName}' is not available. Check configuration and API keys.`);
+      }
+
       this.router.updateProviderStats(providerName, false, 0, 0);
       throw new Error(`Provider '${providerName}' failed: ${this.sanitizeError(error.message)}`);
     }
@@ -653,7 +922,8 @@ Please provide insights about:
         ollama: {
           host: 'http://localhost:11434',
           timeout: 30000,
-          maxRetries: 3
+          maxRetries: 3,
+          batchWindowMs: 0
         },
         gemini: {
           rateLimit: {
@@ -675,17 +945,36 @@ Please provide insights about:
       },
       context: {
         maxLength: 20
+      },
+      performance: {
+        maxConcurrentRequests: 5,
+        // Requests allowed to wait for a slot; 0 = unbounded
+        maxQueuedRequests: 0,
+        cacheEnabled: false,
+        cacheTTL: 3600000,
+        // Canned fallback replies would mask a recovered provider
+        cacheTTLByProvider: { builtin: 0 },
+        // Near-duplicate prompts share cached responses; 0 = exact match only
+        cacheSimilarityThreshold: 0,
+        availabilityTTL: 5000,
+        rateLimitStrategy: 'token-bucket'
       }
     };
 
     try {
-      if (fs.existsSync(configPath)) {
-        const configData = fs.readFileSync(configPath, 'utf8');
-        const userConfig = JSON.parse(configData);
-        return this.mergeConfig(defaultConfig, userConfig);
+      // Parsed file is reused until its mtime changes
+      const filePath = path.resolve(configPath);
+      const { mtimeMs } = fs.statSync(filePath);
+      let cached = configFileCache.get(filePath);
+      if (!cached || cached.mtimeMs !== mtimeMs) {
+        cached = { mtimeMs, config: JSON.parse(fs.readFileSync(filePath, 'utf8')) };
+        configFileCache.set(filePath, cached);
       }
+      return this.mergeConfig(defaultConfig, cached.config);
     } catch (error) {
-      console.warn('⚠️  Config loading failed, using defaults:', error.message);
+      if (error.code !== 'ENOENT') {
+        console.warn('⚠️  Config loading failed, using defaults:', error.message);
+      }
     }
     
     return defaultConfig;
@@ -738,6 +1027,15 @@ Please provide insights about:
       console.error('❌ Failed to save config:', this.sanitizeError(error.message));
     }
   }
+
+  /**
+   * Let in-flight chats and the pending learning writes finish, so a
+   * short-lived process can exit without losing either
+   */
+  async close() {
+    await Promise.allSettled(this.inflight.values());
+    await neuralLearning.flush();
+  }
 }
 
 export default MultiAI;
\ No newline at end of file
@@ -5,7 +5,7 @@
  * Provides GitHub API access and repository management
  */
 
-import { execSync } from 'child_process';
+import { execSync, execFileSync } from 'child_process';
 import fs from 'fs';
 import path from 'path';
 
@@ -13,24 +13,41 @@ export class GitHubIntegration {
   constructor(options = {}) {
     this.token = options.token || process.env.GITHUB_TOKEN;
     this.baseUrl = options.baseUrl || 'https://api.github.com';
+    // Spawning gh/git is the expensive part, so answers that cannot change
+    // within a process are kept after the first lookup
+    this.cliAvailable = null;
+    this.repoInfo = undefined;
   }
 
   /**
    * Check if GitHub CLI is available
    */
   isGitHubCLIAvailable() {
-    try {
-      execSync('gh --version', { stdio: 'ignore' });
-      return true;
-    } catch {
-      return false;
+    if (this.cliAvailable === null) {
+      try {
+        execSync('gh --version', { stdio: 'ignore' });
+        this.cliAvailable = true;
+      } catch {
+        this.cliAvailable = false;
+      }
     }
+    return this.cliAvailable;
   }
 
   /**
    * Get repository information
    */
   async getRepoInfo() {
+    if (this.repoInfo === undefined) {
+      this.repoInfo = await this.fetchRepoInfo();
+    }
+    return this.repoInfo;
+  }
+
+  /**
+   * Look up repository information via gh, falling back to the git remote
+   */
+  async fetchRepoInfo() {
     try {
       if (this.isGitHubCLIAvailable()) {
         const result = execSync('gh repo view --json name,owner,description,url', { encoding: 'utf8' });
@@ -61,14 +78,11 @@ export class GitHubIntegration {
   async createIssue(title, body, labels = []) {
     try {
       if (this.isGitHubCLIAvailable()) {
-        // Sanitize inputs to prevent command injection
-        const safeTitle = title.replace(/["`$\\]/g, '\\$&');
-        const safeBody = body.replace(/["`$\\]/g, '\\$&');
-        const safeLabels = labels.map(label => label.replace(/["`$\\]/g, '\\$&'));
-        
-        const labelsArg = safeLabels.length > 0 ? `--label "${safeLabels.join(',')}"` : '';
-        const command = `gh issue create --title "${safeTitle}" --body "${safeBody}" ${labelsArg}`;
-        const result = execSync(command, { encoding: 'utf8' });
+        // No shell, so nothing to escape; the body is fed on stdin rather
+        // than argv to stay clear of argument length limits and `ps`
+        const args = ['issue', 'create', '--title', title, '--body-file', '-'];
+        if (labels.length > 0) args.push('--label', labels.join(','));
+        const result = execFileSync('gh', args, { input: body, encoding: 'utf8' });
         return { success: true, url: result.trim() };
       }
       
@@ -84,14 +98,10 @@ export class GitHubIntegration {
   async createPullRequest(title, body, branch = null) {
     try {
       if (this.isGitHubCLIAvailable()) {
-        // Sanitize inputs to prevent command injection
-        const safeTitle = title.replace(/["`$\\]/g, '\\$&');
-        const safeBody = body.replace(/["`$\\]/g, '\\$&');
-        const safeBranch = branch ? branch.replace(/["`$\\]/g, '\\$&') : null;
-        
-        const branchArg = safeBranch ? `--head ${safeBranch}` : '';
-        const command = `gh pr create --title "${safeTitle}" --body "${safeBody}" ${branchArg}`;
-        const result = execSync(command, { encoding: 'utf8' });
+        // No shell, so nothing to escape; the body is fed on stdin
+        const args = ['pr', 'create', '--title', title, '--body-file', '-'];
+        if (branch) args.push('--head', branch);
+        const result = execFileSync('gh', args, { input: body, encoding: 'utf8' });
         return { success: true, url: result.trim() };
       }
       
@@ -147,7 +157,8 @@ export class GitHubIntegration {
         execSync('git add .', { stdio: 'inherit' });
       }
       
-      execSync(`git commit -m "${message}"`, { stdio: 'inherit' });
+      // Message on stdin - no quoting issues and no argv length limit
+      execFileSync('git', ['commit', '-F', '-'], { input: message, stdio: ['pipe', 'inherit', 'inherit'] });
       execSync('git push', { stdio: 'inherit' });
       
       return { success: true };
@@ -74,6 +74,29 @@ function simpleGlob(pattern, options = {}) {
   }
 }
 
+// Count lines without materializing an array of every line
+export function countLines(text) {
+  let count = 1;
+  let index = text.indexOf('\n');
+  while (index !== -1) {
+    count++;
+    index = text.indexOf('\n', index + 1);
+  }
+  return count;
+}
+
+// Project section for prompts, left out when nothing is known about the
+// project - every prompt token adds to the provider's prompt processing time
+function projectContextSection(fileContext, withDependencies = true) {
+  const type = fileContext.project?.type;
+  const dependencies = fileContext.dependencies?.main;
+  const using = withDependencies && dependencies?.length ? ` using ${dependencies.join(', ')}` : '';
+  if ((!type || type === 'unknown') && !using) {
+    return '';
+  }
+  return `**Project Context**: ${type || 'unknown'} project${using}\n\n`;
+}
+
 export class IDEFeatures {
   constructor(multiAI) {
     this.ai = multiAI;
@@ -132,7 +155,7 @@ export class IDEFeatures {
         extension: fileExtension,
         language: this.detectLanguage(fileExtension),
         size: fileContent.length,
-        lines: fileContent.split('\n').length
+        lines: countLines(fileContent)
       },
       project: await this.getProjectMetadata(),
       dependencies: await this.getProjectDependencies(),
@@ -200,9 +223,7 @@ ${beforeContext}
 ${afterContext}
 \`\`\`
 
-**Project Context**: ${fileContext.project.type} project using ${fileContext.dependencies.main?.join(', ') || 'unknown dependencies'}
-
-Please provide intelligent code completion suggestions for the cursor position. Consider:
+${projectContextSection(fileContext)}Please provide intelligent code completion suggestions for the cursor position. Consider:
 1. Current syntax context
 2. Variable/function scope
 3. Project dependencies and imports
@@ -248,10 +269,10 @@ ${stagedChanges.map(change => `- ${change.status}: ${change.file}`).join('\n')}
 ${await this.gitIntegration.getStagedDiff()}
 \`\`\`
 
-**Recent Commits** (for style reference):
+${recentCommits.length > 0 ? `**Recent Commits** (for style reference):
 ${recentCommits.map(commit => `- ${commit.hash.substring(0, 7)}: ${commit.message}`).join('\n')}
 
-Generate a concise, descriptive commit message following conventional commit format:
+` : ''}Generate a concise, descriptive commit message following conventional commit format:
 - Use prefixes: feat:, fix:, docs:, style:, refactor:, test:, chore:
 - Keep first line under 50 characters
 - Focus on the "what" and "why", not the "how"
@@ -359,9 +380,7 @@ Provide 3 options:
 ${codeSection}
 \`\`\`
 
-**Project Context**: ${fileContext.project.type} project
-
-Please explain this code section in a clear, educational way:
+${projectContextSection(fileContext, false)}Please explain this code section in a clear, educational way:
 1. **Purpose**: What does this code do?
 2. **How it works**: Step-by-step breakdown
 3. **Key concepts**: Important patterns or principles used
@@ -406,9 +425,7 @@ Keep the explanation accessible but technical enough to be useful.
 ${codeSection}
 \`\`\`
 
-**Project Context**: ${fileContext.project.type} using ${fileContext.dependencies.main?.join(', ')}
-
-Analyze this code and suggest improvements:
+${projectContextSection(fileContext)}Analyze this code and suggest improvements:
 1. **Performance optimizations**
 2. **Readability improvements**
 3. **Best practices alignment**
@@ -771,6 +788,10 @@ class GitIntegration {
   }
 }
 
+// Control-flow keywords for complexity estimation - one alternation so a
+// file is scanned once rather than once per keyword
+const CONTROL_KEYWORDS = /\b(?:if|else|for|while|switch|case|try|catch)\b/g;
+
 /**
  * Code Analysis Helper
  */
@@ -780,7 +801,7 @@ class CodeAnalyzer {
     
     return {
       language,
-      linesOfCode: content.split('\n').length,
+      linesOfCode: countLines(content),
       complexity: this.estimateComplexity(content, language),
       imports: this.extractImports(content, language),
       functions: this.extractFunctions(content, language),
@@ -802,15 +823,11 @@ class CodeAnalyzer {
 
   estimateComplexity(content, language) {
     // Simple complexity estimation based on control structures
-    const controlKeywords = ['if', 'else', 'for', 'while', 'switch', 'case', 'try', 'catch'];
     let complexity = 1; // Base complexity
     
-    for (const keyword of controlKeywords) {
-      const regex = new RegExp(`\\b${keyword}\\b`, 'g');
-      const matches = content.match(regex);
-      if (matches) {
-        complexity += matches.length;
-      }
+    const matches = content.match(CONTROL_KEYWORDS);
+    if (matches) {
+      complexity += matches.length;
     }
     
     return Math.min(complexity, 20); // Cap at 20 for display purposes
@@ -918,14 +935,8 @@ class DebugAssistant {
 ## Debug Analysis Request
 
 **File**: ${filePath}
-**Error Message**: ${errorMessage}
-
-**Stack Trace**:
-\`\`\`
-${stackTrace}
-\`\`\`
-
-**Code Context**:
+${errorMessage ? `**Error Message**: ${errorMessage}\n` : ''}
+${stackTrace ? `**Stack Trace**:\n\`\`\`\n${stackTrace}\n\`\`\`\n\n` : ''}**Code Context**:
 \`\`\`
 ${fileContext}
 \`\`\`
@@ -1,5 +1,12 @@
 #!/usr/bin/env node
 
+// Static text after the query in the default response, built once
+const DEFAULT_RESPONSE_FOOTER = '"\n\nFor more sophisticated responses, try setting up API keys for cloud providers, or IRIS will route to the best available model automatically.';
+
+// Keyword lists for query classification
+const GREETINGS = ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening'];
+const CODING_KEYWORDS = ['javascript', 'python', 'code', 'function', 'programming', 'html', 'css', 'js'];
+
 /**
  * Built-in Provider
  * Simple local AI responses with no external dependencies
@@ -76,7 +83,7 @@ export class BuiltinProvider {
 
       // Default response
       return {
-        content: `${this.getRandomResponse(this.knowledgeBase.general)}\n\nYour query: "${message}"\n\nFor more sophisticated responses, try setting up API keys for cloud providers, or IRIS will route to the best available model automatically.`,
+        content: `${this.getRandomResponse(this.knowledgeBase.general)}\n\nYour query: "${message}${DEFAULT_RESPONSE_FOOTER}`,
         model: 'builtin-v1',
         provider: this.name
       };
@@ -91,8 +98,7 @@ export class BuiltinProvider {
   }
 
   isGreeting(query) {
-    const greetings = ['hello', 'hi', 'hey', 'greetings', 'good morning', 'good afternoon', 'good evening'];
-    return greetings.some(g => query.includes(g));
+    return GREETINGS.some(g => query.includes(g));
   }
 
   tryMath(query) {
@@ -117,8 +123,7 @@ export class BuiltinProvider {
   }
 
   isCodingQuery(query) {
-    const codingKeywords = ['javascript', 'python', 'code', 'function', 'programming', 'html', 'css', 'js'];
-    return codingKeywords.some(keyword => query.includes(keyword));
+    return CODING_KEYWORDS.some(keyword => query.includes(keyword));
   }
 
   getCodingHelp(query) {
@@ -12,6 +12,16 @@ try {
   // Don't log here - will be handled in constructor
 }
 
+// System prompts by task type
+const SYSTEM_PROMPTS = {
+  code: 'You are Claude, an AI assistant created by Anthropic. You are an expert software engineer with deep knowledge of programming languages, software architecture, and best practices. Provide clean, well-documented, secure code with clear explanations.',
+  creative: 'You are Claude, an AI assistant created by Anthropic. You excel at creative thinking, writing, and problem-solving. Approach tasks with imagination and originality while being helpful and harmless.',
+  fast: 'You are Claude, an AI assistant created by Anthropic. Provide concise, accurate, and helpful responses efficiently.',
+  complex: 'You are Claude, an AI assistant created by Anthropic. You excel at complex reasoning, analysis, and breaking down sophisticated problems. Think step-by-step and provide thorough, well-reasoned responses.',
+  analysis: 'You are Claude, an AI assistant created by Anthropic. You are skilled at data analysis, research, and providing insights. Analyze information thoroughly and provide actionable recommendations.',
+  balanced: 'You are Claude, an AI assistant created by Anthropic. You are helpful, harmless, and honest. Provide comprehensive, well-reasoned responses that are both informative and accessible.'
+};
+
 /**
  * Anthropic Claude provider for advanced reasoning and analysis
  * 
@@ -34,6 +44,8 @@ export class ClaudeProvider {
     
     this.client = new Anthropic({
       apiKey: this.apiKey,
+      // Optional shared transport, so every provider reuses one connection pool
+      ...(options.fetch && { fetch: options.fetch })
     });
     
     this.models = {
@@ -81,16 +93,7 @@ export class ClaudeProvider {
   }
 
   getSystemPrompt(taskType) {
-    const prompts = {
-      code: 'You are Claude, an AI assistant created by Anthropic. You are an expert software engineer with deep knowledge of programming languages, software architecture, and best practices. Provide clean, well-documented, secure code with clear explanations.',
-      creative: 'You are Claude, an AI assistant created by Anthropic. You excel at creative thinking, writing, and problem-solving. Approach tasks with imagination and originality while being helpful and harmless.',
-      fast: 'You are Claude, an AI assistant created by Anthropic. Provide concise, accurate, and helpful responses efficiently.',
-      complex: 'You are Claude, an AI assistant created by Anthropic. You excel at complex reasoning, analysis, and breaking down sophisticated problems. Think step-by-step and provide thorough, well-reasoned responses.',
-      analysis: 'You are Claude, an AI assistant created by Anthropic. You are skilled at data analysis, research, and providing insights. Analyze information thoroughly and provide actionable recommendations.',
-      balanced: 'You are Claude, an AI assistant created by Anthropic. You are helpful, harmless, and honest. Provide comprehensive, well-reasoned responses that are both informative and accessible.'
-    };
-    
-    return prompts[taskType] || prompts.balanced;
+    return SYSTEM_PROMPTS[taskType] || SYSTEM_PROMPTS.balanced;
   }
 
   async chat(message, options = {}) {
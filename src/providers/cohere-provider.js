@@ -10,6 +10,8 @@ export class CohereProvider {
   constructor(options = {}) {
     this.name = 'cohere';
     this.apiKey = options.apiKey || process.env.COHERE_API_KEY;
+    // Optional shared transport, so every provider reuses one connection pool
+    this.fetch = options.fetch || fetch;
     this.baseURL = 'https://api.cohere.ai/v1';
     
     this.models = {
@@ -31,7 +33,7 @@ export class CohereProvider {
     if (!this.apiKey) return false;
     
     try {
-      const response = await fetch(`${this.baseURL}/check-api-key`, {
+      const response = await this.fetch(`${this.baseURL}/check-api-key`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${this.apiKey}`,
@@ -53,7 +55,7 @@ export class CohereProvider {
     const model = this.selectModel(options.taskType || 'balanced');
 
     try {
-      const response = await fetch(`${this.baseURL}/generate`, {
+      const response = await this.fetch(`${this.baseURL}/generate`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${this.apiKey}`,
@@ -12,6 +12,16 @@ try {
   // Don't log here - will be handled in constructor
 }
 
+// System prompts by task type
+const SYSTEM_PROMPTS = {
+  code: 'You are an expert software engineer. Provide clean, well-documented code with best practices.',
+  creative: 'You are a creative genius. Think innovatively and provide original, imaginative solutions.',
+  fast: 'You are an efficient assistant. Provide concise, accurate responses quickly.',
+  complex: 'You are a research expert. Analyze complex problems methodically with detailed reasoning.',
+  analysis: 'You are a data analyst. Provide thorough analysis with insights and actionable recommendations.',
+  balanced: 'You are a knowledgeable assistant. Provide comprehensive, well-reasoned responses.'
+};
+
 /**
  * Google Gemini provider for advanced AI capabilities
  */
@@ -59,16 +69,7 @@ export class GeminiProvider {
   }
 
   getSystemPrompt(taskType) {
-    const prompts = {
-      code: 'You are an expert software engineer. Provide clean, well-documented code with best practices.',
-      creative: 'You are a creative genius. Think innovatively and provide original, imaginative solutions.',
-      fast: 'You are an efficient assistant. Provide concise, accurate responses quickly.',
-      complex: 'You are a research expert. Analyze complex problems methodically with detailed reasoning.',
-      analysis: 'You are a data analyst. Provide thorough analysis with insights and actionable recommendations.',
-      balanced: 'You are a knowledgeable assistant. Provide comprehensive, well-reasoned responses.'
-    };
-    
-    return prompts[taskType] || prompts.balanced;
+    return SYSTEM_PROMPTS[taskType] || SYSTEM_PROMPTS.balanced;
   }
 
   async chat(message, options = {}) {
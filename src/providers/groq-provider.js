@@ -21,6 +21,17 @@ import { apiValidator } from '../core/api-validator.js';
 import { requestHandler } from '../core/request-handler.js';
 import { messageFormatter } from '../core/message-formatter.js';
 
+// System prompts by task type
+const SYSTEM_PROMPTS = {
+  code: 'You are an expert software engineer. Provide clean, efficient code with clear explanations. Focus on best practices and performance.',
+  creative: 'You are a creative AI assistant. Generate engaging, original content with flair and imagination.',
+  fast: 'You are a speed-optimized AI assistant. Provide quick, accurate, concise responses.',
+  complex: 'You are an analytical AI assistant. Break down complex problems systematically and provide detailed reasoning.',
+  reasoning: 'You are a logical reasoning expert. Think step-by-step and show your problem-solving process.',
+  analysis: 'You are a data analyst. Provide insights, patterns, and actionable recommendations.',
+  balanced: 'You are a versatile AI assistant. Provide helpful, accurate, and well-structured responses.'
+};
+
 export class GroqProvider {
   constructor(options = {}) {
     this.name = 'groq';
@@ -36,6 +47,8 @@ export class GroqProvider {
     
     this.client = new Groq({
       apiKey: this.apiKey,
+      // Optional shared transport, so every provider reuses one connection pool
+      ...(options.fetch && { fetch: options.fetch })
     });
     
     this.models = {
@@ -82,17 +95,7 @@ export class GroqProvider {
   }
 
   getSystemPrompt(taskType) {
-    const prompts = {
-      code: 'You are an expert software engineer. Provide clean, efficient code with clear explanations. Focus on best practices and performance.',
-      creative: 'You are a creative AI assistant. Generate engaging, original content with flair and imagination.',
-      fast: 'You are a speed-optimized AI assistant. Provide quick, accurate, concise responses.',
-      complex: 'You are an analytical AI assistant. Break down complex problems systematically and provide detailed reasoning.',
-      reasoning: 'You are a logical reasoning expert. Think step-by-step and show your problem-solving process.',
-      analysis: 'You are a data analyst. Provide insights, patterns, and actionable recommendations.',
-      balanced: 'You are a versatile AI assistant. Provide helpful, accurate, and well-structured responses.'
-    };
-    
-    return prompts[taskType] || prompts.balanced;
+    return SYSTEM_PROMPTS[taskType] || SYSTEM_PROMPTS.balanced;
   }
 
   async chat(message, options = {}) {
@@ -187,13 +190,13 @@ export class GroqProvider {
 
   async healthCheck() {
     try {
-      const startTime = Date.now();
+      const startTime = performance.now();
       const response = await this.client.chat.completions.create({
         model: 'llama-3.1-8b-instant',
         messages: [{ role: 'user', content: 'Health check' }],
         max_tokens: 5
       });
-      const responseTime = Date.now() - startTime;
+      const responseTime = Math.round(performance.now() - startTime);
       
       return {
         status: 'healthy',
@@ -6,26 +6,26 @@
  * No API keys needed - runs entirely local
  */
 
-let pipeline = null;
-let env = null;
+// Transformers.js pulls in the ONNX runtime, so it is imported on first
+// use rather than whenever this module is loaded
+let transformersLoad = null;
 
-try {
-  // Try to import Transformers.js
-  const transformers = await import('@xenova/transformers');
-  pipeline = transformers.pipeline;
-  env = transformers.env;
-  
-  // Configure to run locally
-  env.allowRemoteModels = false;
-  env.allowLocalModels = true;
-} catch (error) {
-  // Will be handled in constructor
+function loadPipeline() {
+  transformersLoad ??= import('@xenova/transformers')
+    .then(({ pipeline, env }) => {
+      // Configure to run locally
+      env.allowRemoteModels = false;
+      env.allowLocalModels = true;
+      return pipeline;
+    })
+    .catch(() => null);
+  return transformersLoad;
 }
 
 export class HuggingFaceProvider {
   constructor(options = {}) {
     this.name = 'huggingface';
-    this.available = !!pipeline;
+    this.available = null; // Unknown until Transformers.js is loaded
     this.models = {
       fast: 'Xenova/distilbert-base-uncased',
       coding: 'Xenova/CodeBERTa-small-v1',
@@ -41,6 +41,7 @@ export class HuggingFaceProvider {
   }
 
   async isAvailable() {
+    this.available = !!(await loadPipeline());
     return this.available;
   }
 
@@ -48,6 +49,10 @@ export class HuggingFaceProvider {
     const key = `${task}:${model}`;
     if (!this.pipes.has(key)) {
       try {
+        const pipeline = await loadPipeline();
+        if (!pipeline) {
+          throw new Error('Transformers.js is not installed');
+        }
         const pipe = await pipeline(task, model);
         this.pipes.set(key, pipe);
         return pipe;
@@ -1,5 +1,7 @@
 #!/usr/bin/env node
 
+import { ConcurrencyLimiter } from '../core/concurrency-limiter.js';
+
 // Optional dependency - graceful fallback if not installed
 let Ollama;
 try {
@@ -9,6 +11,83 @@ try {
   // Silently fail - provider will handle unavailability
 }
 
+// One client per Ollama host (and transport), shared by every provider
+// instance, so requests reuse the same client and its pooled keep-alive
+// connections
+const clients = new Map();
+
+export function getClient(host, fetch) {
+  let hostClients = clients.get(host);
+  if (!hostClients) {
+    hostClients = new Map();
+    clients.set(host, hostClients);
+  }
+
+  let client = hostClients.get(fetch);
+  if (!client) {
+    client = new Ollama(fetch ? { host, fetch } : { host });
+    hostClients.set(fetch, client);
+  }
+  return client;
+}
+
+// A cached model list younger than this is trusted when a task's model is
+// missing; an older one is re-read first, in case the model was pulled since
+const MODEL_LIST_FRESH_MS = 30000;
+
+// One generation limiter per Ollama host. The server runs OLLAMA_NUM_PARALLEL
+// generations at once and queues the rest, so excess requests wait here
+// instead of slowing down every request already running
+const generationLimiters = new Map();
+
+function getGenerationLimiter(host, maxConcurrent) {
+  let limiter = generationLimiters.get(host);
+  if (!limiter) {
+    limiter = new ConcurrencyLimiter(maxConcurrent || Number(process.env.OLLAMA_NUM_PARALLEL) || 2);
+    generationLimiters.set(host, limiter);
+  } else if (maxConcurrent && maxConcurrent !== limiter.maxConcurrent) {
+    // The limiter is shared by every provider on this host, so an explicit
+    // setting resizes it for all of them rather than being ignored
+    console.warn(`⚠️  Ollama generation limit for ${host} changed from ${limiter.maxConcurrent} to ${maxConcurrent}`);
+    limiter.resize(maxConcurrent);
+  }
+  return limiter;
+}
+
+// Pending batch window per Ollama host. Generations arriving within the
+// window are released together, so the server can schedule them into the
+// same forward passes instead of picking them up one at a time
+const batchWindows = new Map();
+
+function waitForBatchWindow(host, windowMs) {
+  let window = batchWindows.get(host);
+  if (!window) {
+    window = new Promise(resolve => setTimeout(() => {
+      batchWindows.delete(host);
+      resolve();
+    }, windowMs));
+    batchWindows.set(host, window);
+  }
+  return window;
+}
+
+// Ollama's error for a model that is not installed
+const MODEL_NOT_FOUND = /model .*not found/i;
+
+// System prompts by task type
+const SYSTEM_PROMPTS = {
+  code: 'You are an expert programmer. Provide clean, efficient code with explanations.',
+  creative: 'You are a creative assistant. Think outside the box and provide imaginative solutions.',
+  fast: 'You are a helpful assistant. Provide quick, accurate responses.',
+  complex: 'You are an expert analyst. Break down complex problems step-by-step.',
+  analysis: 'You are a thoughtful assistant. Analyze thoroughly and provide detailed insights.',
+  balanced: 'You are an intelligent assistant. Think step-by-step and provide helpful responses.'
+};
+
+// System messages built once per task type; only the user turn changes
+const SYSTEM_MESSAGES = Object.fromEntries(Object.entries(SYSTEM_PROMPTS)
+  .map(([taskType, content]) => [taskType, Object.freeze({ role: 'system', content })]));
+
 /**
  * Ollama provider for local AI models
  * 
@@ -20,7 +99,14 @@ export class OllamaProvider {
   constructor(options = {}) {
     this.name = 'ollama';
     this.available = !!Ollama;
-    this.ollama = Ollama ? new Ollama({ host: options.host || 'http://localhost:11434' }) : null;
+    // options.fetch swaps the transport, e.g. an HTTP/2-capable fetch for a
+    // remote Ollama behind a reverse proxy
+    const host = options.host || 'http://localhost:11434';
+    this.ollama = Ollama ? getClient(host, options.fetch) : null;
+    this.generationLimiter = getGenerationLimiter(host, options.maxConcurrentGenerations);
+    // Batch window in ms for bursty workloads; 0 sends each request at once
+    this.host = host;
+    this.batchWindowMs = options.batchWindowMs || 0;
     this.models = {
       fast: 'llama3.2:latest',
       balanced: 'llama3:latest',
@@ -35,6 +121,13 @@ export class OllamaProvider {
     };
     this.priority = 1; // High priority for local models
     this.costPerToken = 0; // Free local models
+    // Installed model names, so picking a model needs no round-trip. Kept
+    // until something shows it is out of date rather than on a timer
+    this.installedModels = null;
+    this.modelsListedAt = 0;
+    this.modelsRequest = null;
+    // Routing details (e.g. model substitutions), as MultiAI's debug level
+    this.debug = options.debug || false;
   }
 
   async isAvailable() {
@@ -42,41 +135,99 @@ export class OllamaProvider {
       return false;
     }
     try {
-      await this.ollama.list();
+      await this.getAvailableModels(true);
       return true;
     } catch (error) {
       return false;
     }
   }
 
-  async getAvailableModels() {
+  async getAvailableModels(forceRefresh = false) {
     if (!this.available || !this.ollama) {
       return [];
     }
-    
+
+    if (!forceRefresh && this.installedModels) {
+      return this.installedModels;
+    }
+
     try {
-      const response = await this.ollama.list();
-      return response.models.map(m => m.name);
+      // Concurrent callers share one /api/tags request
+      this.modelsRequest ??= this.ollama.list()
+        .then(response => {
+          this.installedModels = response.models.map(m => m.name);
+          this.modelsListedAt = Date.now();
+          return this.installedModels;
+        })
+        .finally(() => {
+          this.modelsRequest = null;
+        });
+      return await this.modelsRequest;
     } catch (error) {
+      if (forceRefresh) throw error;
       return [];
     }
-    }
+  }
+
+  /**
+   * Drop the cached model list - the next lookup re-reads it from Ollama
+   */
+  invalidateModels() {
+    this.installedModels = null;
+  }
 
   selectModel(taskType) {
     return this.models[taskType] || this.models.balanced;
   }
 
+  /**
+   * Task model if it is installed, otherwise the first installed candidate.
+   * Checked against the cached model list in one pass rather than probing
+   * each candidate in turn
+   */
+  async resolveModel(taskType, options = {}) {
+    const preferred = this.selectModel(taskType);
+    let installed = await this.getAvailableModels();
+    if (installed.length === 0 || installed.includes(preferred)) {
+      return preferred;
+    }
+
+    // Re-read a list that may predate the model being pulled before
+    // substituting another one
+    if (Date.now() - this.modelsListedAt > MODEL_LIST_FRESH_MS) {
+      installed = await this.getAvailableModels(true).catch(() => installed);
+      if (installed.length === 0 || installed.includes(preferred)) {
+        return preferred;
+      }
+    }
+
+    const candidates = [this.models.balanced, this.models.fast, ...installed];
+    const model = candidates.find(candidate => installed.includes(candidate));
+    this.debugLog(options, () => `🔁 Ollama model ${preferred} not installed - using ${model}`);
+    return model;
+  }
+
+  /**
+   * Routing details, shown at debug level or with --verbose
+   */
+  debugLog(options, buildMessage) {
+    if (this.debug || options.verbose) {
+      console.log(buildMessage());
+    }
+  }
+
   getSystemPrompt(taskType) {
-    const prompts = {
-      code: 'You are an expert programmer. Provide clean, efficient code with explanations.',
-      creative: 'You are a creative assistant. Think outside the box and provide imaginative solutions.',
-      fast: 'You are a helpful assistant. Provide quick, accurate responses.',
-      complex: 'You are an expert analyst. Break down complex problems step-by-step.',
-      analysis: 'You are a thoughtful assistant. Analyze thoroughly and provide detailed insights.',
-      balanced: 'You are an intelligent assistant. Think step-by-step and provide helpful responses.'
-    };
-    
-    return prompts[taskType] || prompts.balanced;
+    return SYSTEM_PROMPTS[taskType] || SYSTEM_PROMPTS.balanced;
+  }
+
+  /**
+   * Chat messages for a request: the prebuilt system turn plus the user turn
+   */
+  buildMessages(taskType, message) {
+    return [
+      SYSTEM_MESSAGES[taskType] || SYSTEM_MESSAGES.balanced,
+      { role: 'user', content: message }
+    ];
   }
 
   async chat(message, options = {}) {
@@ -85,69 +236,123 @@ export class OllamaProvider {
     }
 
     const taskType = options.taskType || 'balanced';
-    const model = this.selectModel(taskType);
-    const systemPrompt = this.getSystemPrompt(taskType);
+    const model = await this.resolveModel(taskType, options);
 
     try {
-      const response = await this.ollama.chat({
-        model: model,
-        messages: [
-          {
-            role: 'system',
-            content: systemPrompt
-          },
-          {
-            role: 'user',
-            content: message
+      if (this.batchWindowMs > 0) {
+        await waitForBatchWindow(this.host, this.batchWindowMs);
+      }
+
+      // Always streamed and accumulated here - long generations avoid the
+      // buffering and timeouts of Ollama's non-streaming responses
+      const { parts, evalCount } = await this.generationLimiter.run(async () => {
+        const stream = await this.ollama.chat({
+          model: model,
+          messages: this.buildMessages(taskType, message),
+          stream: true
+        });
+
+        // options.onToken sees each chunk (and this provider's name) as it
+        // arrives, so callers can show partial output before the full
+        // response has been assembled
+        const parts = [];
+        let evalCount = 0;
+        for await (const part of stream) {
+          const content = part.message?.content || '';
+          parts.push(content);
+          if (content && options.onToken) {
+            options.onToken(content, this.name);
           }
-        ],
-        stream: options.stream || false
+          if (part.done) {
+            evalCount = part.eval_count || 0;
+          }
+        }
+        return { parts, evalCount };
       });
 
       return {
-        response: response.message?.content || '',
+        response: parts.join(''),
         model: model,
         provider: this.name,
         taskType: taskType,
         timestamp: new Date().toISOString(),
         usage: {
-          tokens: response.eval_count || 0,
+          tokens: evalCount,
           cost: 0 // Free local models
         }
       };
 
     } catch (error) {
+      if (MODEL_NOT_FOUND.test(error.message)) {
+        // Model was removed since the list was read
+        this.invalidateModels();
+      }
       throw new Error(`Ollama chat error: ${error.message}`);
     }
   }
 
   async streamChat(message, options = {}) {
     const taskType = options.taskType || 'balanced';
-    const model = this.selectModel(taskType);
-    const systemPrompt = this.getSystemPrompt(taskType);
+    const model = await this.resolveModel(taskType, options);
 
     try {
       const response = await this.ollama.chat({
         model: model,
-        messages: [
-          {
-            role: 'system',
-            content: systemPrompt
-          },
-          {
-            role: 'user',
-            content: message
-          }
-        ],
+        messages: this.buildMessages(taskType, message),
         stream: true
       });
 
       return response;
     } catch (error) {
+      if (MODEL_NOT_FOUND.test(error.message)) {
+        this.invalidateModels();
+      }
       throw new Error(`Ollama stream error: ${error.message}`);
     }
   }
 
+  /**
+   * Load the task model into memory so the first real request skips the cold start
+   */
+  async warmup(taskType = 'balanced') {
+    if (!this.ollama) {
+      return false;
+    }
+
+    try {
+      // An empty prompt makes Ollama load the model without generating
+      await this.ollama.generate({ model: await this.resolveModel(taskType), prompt: '' });
+      return true;
+    } catch (error) {
+      return false;
+    }
+  }
+
+  /**
+   * Pull a model through the API, streaming progress to onProgress
+   */
+  async pullModel(model, onProgress = () => {}) {
+    if (!this.ollama) {
+      throw new Error('Local AI provider not available. Check system configuration.');
+    }
+
+    let status = '';
+    for await (const progress of await this.ollama.pull({ model, stream: true })) {
+      status = progress.status;
+      onProgress(progress);
+    }
+
+    if (status !== 'success') {
+      throw new Error(`Ollama pull did not complete: ${status || 'no response'}`);
+    }
+
+    // Record the new model instead of re-reading the whole list
+    if (this.installedModels && !this.installedModels.includes(model)) {
+      this.installedModels = [...this.installedModels, model];
+    }
+    return true;
+  }
+
   async validateModel(modelName) {
     const available = await this.getAvailableModels();
     return available.some(model => model.includes(modelName.split(':')[0]));
@@ -160,6 +365,8 @@ export class OllamaProvider {
         status: 'healthy',
         provider: this.name,
         models: response.models.length,
+        maxConcurrentGenerations: this.generationLimiter.maxConcurrent,
+        batchWindowMs: this.batchWindowMs,
         timestamp: new Date().toISOString()
       };
     } catch (error) {
@@ -17,6 +17,17 @@ try {
   // Don't log here - will be handled in constructor
 }
 
+// System prompts by task type
+const SYSTEM_PROMPTS = {
+  code: 'You are an expert software engineer and computer scientist. Provide clean, efficient, well-documented code with best practices. Think step by step through complex problems.',
+  creative: 'You are a creative genius and expert writer. Think imaginatively and provide original, engaging content.',
+  fast: 'You are an efficient AI assistant. Provide concise, accurate responses quickly.',
+  complex: 'You are an expert researcher and analyst. Break down complex problems systematically. Think step by step and show your reasoning process.',
+  reasoning: 'You are an expert at logical reasoning and problem-solving. Think through problems step by step, showing your work and reasoning process.',
+  analysis: 'You are a data analyst and researcher. Provide thorough analysis with insights and actionable recommendations.',
+  balanced: 'You are a knowledgeable AI assistant. Provide comprehensive, well-reasoned responses.'
+};
+
 export class OpenAIProvider {
   constructor(options = {}) {
     this.name = 'openai';
@@ -32,6 +43,8 @@ export class OpenAIProvider {
     
     this.client = new OpenAI({
       apiKey: this.apiKey,
+      // Optional shared transport, so every provider reuses one connection pool
+      ...(options.fetch && { fetch: options.fetch })
     });
     
     this.models = {
@@ -79,17 +92,7 @@ export class OpenAIProvider {
   }
 
   getSystemPrompt(taskType) {
-    const prompts = {
-      code: 'You are an expert software engineer and computer scientist. Provide clean, efficient, well-documented code with best practices. Think step by step through complex problems.',
-      creative: 'You are a creative genius and expert writer. Think imaginatively and provide original, engaging content.',
-      fast: 'You are an efficient AI assistant. Provide concise, accurate responses quickly.',
-      complex: 'You are an expert researcher and analyst. Break down complex problems systematically. Think step by step and show your reasoning process.',
-      reasoning: 'You are an expert at logical reasoning and problem-solving. Think through problems step by step, showing your work and reasoning process.',
-      analysis: 'You are a data analyst and researcher. Provide thorough analysis with insights and actionable recommendations.',
-      balanced: 'You are a knowledgeable AI assistant. Provide comprehensive, well-reasoned responses.'
-    };
-    
-    return prompts[taskType] || prompts.balanced;
+    return SYSTEM_PROMPTS[taskType] || SYSTEM_PROMPTS.balanced;
   }
 
   async chat(message, options = {}) {
@@ -10,6 +10,8 @@ export class TogetherProvider {
   constructor(options = {}) {
     this.name = 'together';
     this.apiKey = options.apiKey || process.env.TOGETHER_API_KEY;
+    // Optional shared transport, so every provider reuses one connection pool
+    this.fetch = options.fetch || fetch;
     this.baseURL = 'https://api.together.xyz/v1';
     
     this.models = {
@@ -33,7 +35,7 @@ export class TogetherProvider {
     if (!this.apiKey) return false;
     
     try {
-      const response = await fetch(`${this.baseURL}/models`, {
+      const response = await this.fetch(`${this.baseURL}/models`, {
         headers: {
           'Authorization': `Bearer ${this.apiKey}`,
           'Content-Type': 'application/json'
@@ -53,7 +55,7 @@ export class TogetherProvider {
     const model = this.selectModel(options.taskType || 'balanced');
 
     try {
-      const response = await fetch(`${this.baseURL}/chat/completions`, {
+      const response = await this.fetch(`${this.baseURL}/chat/completions`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${this.apiKey}`,
@@ -92,7 +94,7 @@ export class TogetherProvider {
 
   async getAvailableModels() {
     try {
-      const response = await fetch(`${this.baseURL}/models`, {
+      const response = await this.fetch(`${this.baseURL}/models`, {
         headers: {
           'Authorization': `Bearer ${this.apiKey}`
         }
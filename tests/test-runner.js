@@ -6,7 +6,13 @@
  */
 
 import { MultiAI } from '../src/index.js';
+import { ConcurrencyLimiter } from '../src/core/concurrency-limiter.js';
+import { ResponseCache } from '../src/core/response-cache.js';
+import { TokenBucket, SlidingWindowLimiter, createRateLimiter } from '../src/core/rate-limiter.js';
+import { NeuralLearningSystem, neuralLearning } from '../src/core/neural-learning.js';
+import { usageMonitor } from '../src/core/usage-monitor.js';
 import fs from 'fs';
+import os from 'os';
 import path from 'path';
 
 class TestRunner {
@@ -67,6 +73,53 @@ class TestRunner {
 // Initialize test runner
 const runner = new TestRunner();
 
+// Run a test with HOME, the shared learning system and the usage logs
+// pointed at a temp dir, so it never writes to ~/.iris or the repo's
+// .usage-log and .anomalies
+async function withTempHome(testFn) {
+  const home = fs.mkdtempSync(path.join(os.tmpdir(), 'iris-home-'));
+  const previous = {
+    home: process.env.HOME,
+    learningDataPath: neuralLearning.learningDataPath,
+    memoryLogPath: neuralLearning.memoryLogPath,
+    logFile: usageMonitor.logFile,
+    anomalyFile: usageMonitor.anomalyFile
+  };
+  process.env.HOME = home;
+  neuralLearning.learningDataPath = path.join(home, '.iris', 'learning-data.json');
+  neuralLearning.memoryLogPath = path.join(home, '.iris', 'learning-memory.ndjson');
+  usageMonitor.logFile = path.join(home, '.usage-log');
+  usageMonitor.anomalyFile = path.join(home, '.anomalies');
+
+  try {
+    return await testFn(home);
+  } finally {
+    await neuralLearning.flush();
+    process.env.HOME = previous.home;
+    neuralLearning.learningDataPath = previous.learningDataPath;
+    neuralLearning.memoryLogPath = previous.memoryLogPath;
+    usageMonitor.logFile = previous.logFile;
+    usageMonitor.anomalyFile = previous.anomalyFile;
+    fs.rmSync(home, { recursive: true, force: true });
+  }
+}
+
+// Minimal in-memory provider for routing tests; counts its chat calls
+function fakeProvider(name, { available = true, priority = 5, delay = 0 } = {}) {
+  return {
+    name,
+    priority,
+    calls: 0,
+    getCapabilities: () => ({ privacy: 'local' }),
+    isAvailable: async () => available,
+    async chat() {
+      this.calls++;
+      await new Promise(resolve => setTimeout(resolve, delay));
+      return { response: `${name} reply`, model: 'fake', provider: name, usage: { cost: 0 } };
+    }
+  };
+}
+
 // Basic functionality tests
 runner.test('MultiAI constructor initializes correctly', () => {
   const ai = new MultiAI();
@@ -142,6 +195,18 @@ runner.test('Error sanitization works correctly', () => {
   runner.assertTrue(sanitized.includes('[REDACTED]'), 'Should show redacted placeholder');
 });
 
+runner.test('Batch chat reports per-message failures', async () => {
+  const ai = new MultiAI();
+  ai.initialized = true; // Skip provider discovery - validation fails first
+
+  const results = await ai.chatBatch(['', 'a'.repeat(10001), ''], { maxConcurrency: 2 });
+
+  runner.assertEquals(results.length, 3, 'Should return one result per message, duplicates included');
+  runner.assertTrue(results.every(r => r.success === false), 'Should mark invalid messages as failed');
+  runner.assertTrue(results[1].error.includes('too long'), 'Should keep results in input order');
+  runner.assertTrue(results[2] !== results[0], 'Duplicates should get their own result objects');
+});
+
 runner.test('Configuration merging works correctly', () => {
   const ai = new MultiAI();
   
@@ -178,6 +243,169 @@ runner.test('System status returns comprehensive data', async () => {
   runner.assertTrue(status.resources !== undefined, 'Should have resources info');
 });
 
+runner.test('Concurrency limiter caps parallel tasks', async () => {
+  const limiter = new ConcurrencyLimiter(2);
+  let active = 0;
+  let peak = 0;
+
+  const results = await limiter.map([1, 2, 3, 4, 5], async (value) => {
+    active++;
+    peak = Math.max(peak, active);
+    await new Promise(resolve => setTimeout(resolve, 5));
+    active--;
+    return value * 2;
+  });
+
+  runner.assertEquals(peak, 2, 'Should never exceed the concurrency limit');
+  runner.assertEquals(results.join(','), '2,4,6,8,10', 'Should preserve result order');
+
+  const bounded = new ConcurrencyLimiter(1, 1);
+  const settled = await Promise.allSettled([1, 2, 3].map(() =>
+    bounded.run(() => new Promise(resolve => setTimeout(resolve, 5)))));
+  runner.assertEquals(settled.map(r => r.status).join(','), 'fulfilled,fulfilled,rejected',
+    'Should reject tasks beyond the queue limit');
+
+  const resized = new ConcurrencyLimiter(1);
+  let started = 0;
+  const tasks = [1, 2, 3].map(() => resized.run(async () => {
+    started++;
+    await new Promise(resolve => setTimeout(resolve, 5));
+  }));
+  resized.resize(3);
+  await new Promise(resolve => setImmediate(resolve));
+  runner.assertEquals(started, 3, 'Growing the limit should start queued tasks');
+  await Promise.all(tasks);
+  runner.assertEquals(resized.active, 0, 'Should release every slot');
+});
+
+runner.test('Rate limiters admit bursts up to capacity', async () => {
+  const bucket = new TokenBucket(1000, 3);
+  runner.assertTrue([1, 2, 3].every(() => bucket.tryAcquire()), 'Should admit a full burst');
+  runner.assertTrue(!bucket.tryAcquire(), 'Should reject once the bucket is empty');
+
+  await new Promise(resolve => setTimeout(resolve, 5));
+  runner.assertTrue(bucket.tryAcquire(), 'Should refill continuously instead of per window');
+
+  const window = new SlidingWindowLimiter(2, 20);
+  runner.assertTrue(window.tryAcquire() && window.tryAcquire(), 'Should admit up to the limit');
+  runner.assertTrue(!window.tryAcquire(), 'Should cap requests within the window');
+  window.release();
+  runner.assertTrue(window.tryAcquire(), 'Released admissions should free their slot');
+
+  const perMinute = createRateLimiter(60);
+  runner.assertEquals(perMinute.capacity, 10, 'Should not allow a full minute of quota in one burst');
+});
+
+runner.test('Response cache stores and expires entries', async () => {
+  const cacheDir = fs.mkdtempSync(path.join(os.tmpdir(), 'iris-cache-'));
+  const cache = new ResponseCache({ cacheDir, ttl: 20 });
+
+  try {
+    const key = cache.createKey('What is 2+2?', { taskType: 'fast' });
+    runner.assertTrue(key !== cache.createKey('What is 2+2?', { taskType: 'code' }), 'Key should depend on task type');
+    runner.assertTrue(key !== cache.createKey('What is 2+2?', { taskType: 'fast', model: 'llama3' }), 'Key should depend on model');
+    runner.assertEquals(cache.get(key), null, 'Should miss before storing');
+
+    cache.set(key, { response: '4' });
+    runner.assertEquals(cache.get(key).response, '4', 'Should hit after storing');
+
+    await new Promise(resolve => setTimeout(resolve, 30));
+    runner.assertEquals(cache.get(key), null, 'Should expire after TTL');
+
+    const perProvider = new ResponseCache({ cacheDir, ttlByProvider: { builtin: 0 } });
+    perProvider.set('fallback', { response: 'canned', provider: 'builtin' });
+    runner.assertEquals(perProvider.get('fallback'), null, 'Zero TTL should skip caching for that provider');
+
+    const disabled = new ResponseCache({ cacheDir, ttl: 0 });
+    disabled.set('anything', { response: 'x', provider: 'ollama' });
+    runner.assertEquals(disabled.get('anything'), null, 'Zero default TTL should disable caching');
+
+    const lru = new ResponseCache({ cacheDir, maxSize: 2 });
+    ['a', 'b', 'c'].forEach(k => lru.set(k, k));
+    runner.assertEquals(lru.getStats().memoryEntries, 2, 'Memory layer should stay bounded');
+    runner.assertEquals(lru.get('a'), 'a', 'Evicted entries should still be served from disk');
+
+    const similar = new ResponseCache({ cacheDir, similarityThreshold: 0.8 });
+    const original = similar.createKey('How do I reverse a list in Python?', { taskType: 'code' });
+    similar.set(original, { response: 'reversed()' });
+    const nearKey = similar.createKey('how do I reverse a list in python', { taskType: 'code' });
+    runner.assertTrue(nearKey !== original, 'Each prompt should keep its own key');
+    runner.assertEquals(similar.get(nearKey)?.response, 'reversed()', 'Near-duplicate prompts should read a similar entry');
+    runner.assertEquals(similar.get(similar.createKey('How do I sort a dict in Go?', { taskType: 'code' })), null,
+      'Different prompts should not match');
+
+    const expiring = new ResponseCache({ cacheDir, ttl: 20, similarityThreshold: 0.6 });
+    const safeKey = expiring.createKey('is this code safe to run in production');
+    expiring.set(safeKey, { response: 'yes' });
+    await new Promise(resolve => setTimeout(resolve, 30));
+    const negatedKey = expiring.createKey('is this code not safe to run in production');
+    runner.assertEquals(expiring.get(negatedKey), null, 'Expired entries should not match similar prompts');
+    expiring.set(negatedKey, { response: 'no' });
+    runner.assertEquals(expiring.get(expiring.createKey('is this code safe to run in production')), null,
+      'Storing a similar prompt must not overwrite the original key');
+  } finally {
+    fs.rmSync(cacheDir, { recursive: true, force: true });
+  }
+});
+
+runner.test('Router walks the fallback order past excluded providers', () => withTempHome(async () => {
+  const ai = new MultiAI();
+  const router = ai.router;
+  const [down, best, next] = [
+    fakeProvider('down', { available: false }),
+    fakeProvider('best', { priority: 1 }),
+    fakeProvider('next')
+  ];
+  [down, best, next].forEach(provider => router.registerProvider(provider));
+  router.setFallbackOrder(['down', 'next', 'best']);
+
+  runner.assertEquals((await router.nextFallbackProvider(['best'])).name, 'next',
+    'Should skip unavailable and excluded providers');
+  runner.assertEquals(await router.nextFallbackProvider(['best', 'next']), null,
+    'Should return null when nothing is left');
+  runner.assertEquals((await router.selectProvider('balanced', { excludeProviders: ['down'] })).name, 'best',
+    'Caller exclusions should still be scored');
+
+  const result = await router.executeRequest('What is 2+2?', { excludeProviders: ['best'], maxRetries: 1 });
+  runner.assertEquals(result.provider, 'next', 'Caller exclusions should apply on the first attempt');
+  runner.assertEquals(best.calls, 0, 'Excluded provider should never be called');
+}));
+
+runner.test('Identical concurrent chats share one provider call', () => withTempHome(async () => {
+  const ai = new MultiAI();
+  ai.initialized = true; // Only the fake provider below is registered
+  const provider = fakeProvider('solo', { delay: 10 });
+  ai.router.registerProvider(provider);
+
+  const [first, second] = await Promise.all([
+    ai.chat('What is 2+2?', { cache: true }),
+    ai.chat('What is 2+2?', { cache: true })
+  ]);
+
+  runner.assertEquals(provider.calls, 1, 'Should send the prompt to the provider once');
+  runner.assertEquals(first.response, second.response, 'Both callers should get the same reply');
+  runner.assertTrue(second.deduplicated === true, 'Second caller should be marked deduplicated');
+  runner.assertEquals(ai.inflight.size, 0, 'Should clear the in-flight entry');
+}));
+
+runner.test('Legacy learning memory migrates to the log once', () => withTempHome(async (home) => {
+  const memory = [
+    { timestamp: 1, taskType: 'code', provider: 'ollama', success: true, responseTime: 10 },
+    { timestamp: 2, taskType: 'fast', provider: 'groq', success: false }
+  ];
+  fs.mkdirSync(path.join(home, '.iris'));
+  fs.writeFileSync(path.join(home, '.iris', 'learning-data.json'), JSON.stringify({ memory }));
+
+  runner.assertEquals(new NeuralLearningSystem().contextMemory.length, 2, 'Should load legacy memory');
+  const reloaded = new NeuralLearningSystem();
+  runner.assertEquals(reloaded.contextMemory.length, 2, 'Reloading should not duplicate migrated memory');
+  runner.assertEquals(reloaded.memoryLogLines, 2, 'Log should hold each migrated entry once');
+
+  reloaded.learnFromInteraction({ message: 'fix this bug', provider: 'ollama', taskType: 'code', responseTime: 5, success: true });
+  await reloaded.flush();
+  runner.assertEquals(new NeuralLearningSystem().contextMemory.length, 3, 'New entries should be appended to the log');
+}));
+
 // Provider-specific tests (if available)
 runner.test('Provider availability check works', async () => {
   const ai = new MultiAI();